@@ -1,5 +1,6 @@
 import os
-from pydantic import BaseSettings, PostgresDsn
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
@@ -7,6 +8,7 @@ from typing import Optional
 class Settings(BaseSettings):
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8000
+    LOG_LEVEL: str = "INFO"
 
     POSTGRES_USER: str = "paster"
     POSTGRES_PASSWORD: str = "paster"
@@ -15,12 +17,36 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int = 5432
 
     DATABASE_URL: Optional[str] = None
+
+    # Pool de conexões do SQLAlchemy
+    SQLALCHEMY_POOL_SIZE: int = 20
+    SQLALCHEMY_MAX_OVERFLOW: int = 20
+    SQLALCHEMY_POOL_TIMEOUT: int = 30
+    SQLALCHEMY_POOL_RECYCLE: int = 1800
+
+    # Quantidade de áreas mantidas no cache de GET /areas/{id}
+    AREA_CACHE_SIZE: int = 512
+
+    # Relações não carregadas explicitamente nas consultas de área:
+    # True levanta erro (desenvolvimento); False devolve vazio (produção)
+    ORM_RAISELOAD: bool = True
+
+    # Cria as tabelas no boot; defina RUN_MIGRATIONS=0 nos workers extras
+    RUN_MIGRATIONS: bool = True
     
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = None
-    class Config(BaseSettings.Config):
-        env_file = ".env"
-        case_sensitive = True
+    # Chamadas simultâneas à OpenAI por worker
+    OPENAI_MAX_CONCURRENCY: int = 20
+    # Novas tentativas das chamadas de chat em 429/5xx/falha de conexão (backoff do próprio SDK)
+    OPENAI_MAX_RETRIES: int = 5
+
+    # Cache das respostas da OpenAI (Redis opcional, compartilhado entre workers)
+    LLM_CACHE_TTL: int = 3600
+    REDIS_URL: Optional[str] = None
+
+    # extra="ignore": variáveis do .env que não são campos daqui não geram erro
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, extra="ignore")
 
     @property
     def db_url(self) -> str:
@@ -28,4 +54,19 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return f"postgresql+psycopg2://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Lê o ambiente/.env uma única vez por processo."""
+    return Settings()
+
+
+async def current_settings() -> Settings:
+    """
+    get_settings como dependência das rotas: sendo async, o FastAPI a resolve no
+    próprio event loop, sem passar pelo pool de threads a cada requisição.
+    Sobrescrevível via dependency_overrides.
+    """
+    return get_settings()
+
+
+settings = get_settings()
@@ -0,0 +1,19 @@
+import logging
+
+from core.config import get_settings
+
+
+def setup_logging() -> None:
+    """
+    Configura o logging da aplicação uma única vez (chamado pelo main.py).
+    Se o root logger já tem handlers, só ajusta o nível, para não duplicar saída.
+    """
+    level = get_settings().LOG_LEVEL.upper()
+    root = logging.getLogger()
+    if root.handlers:
+        root.setLevel(level)
+        return
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
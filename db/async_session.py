@@ -0,0 +1,34 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.config import settings
+
+
+def _async_url(url: str):
+    """
+    Converte a URL do banco (psycopg2) para o driver asyncpg.
+    O asyncpg não conhece `sslmode`: o valor vai no parâmetro `ssl`.
+    """
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    if "sslmode" in async_url.query:
+        sslmode = async_url.query["sslmode"]
+        async_url = async_url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return async_url
+
+
+async_engine = create_async_engine(
+    _async_url(settings.db_url),
+    echo=False,
+    pool_size=settings.SQLALCHEMY_POOL_SIZE,
+    max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
+    pool_timeout=settings.SQLALCHEMY_POOL_TIMEOUT,
+    pool_recycle=settings.SQLALCHEMY_POOL_RECYCLE,
+    pool_pre_ping=True,  # descarta conexões derrubadas pelo provedor antes de usar
+)
+# expire_on_commit=False: com AsyncSession não há lazy load implícito,
+# então os objetos precisam continuar válidos depois do commit
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
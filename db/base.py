@@ -1,3 +1,6 @@
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+# registra todos os models no metadata (precisa vir depois de Base)
+from models import area, observation, plant, site  # noqa: E402,F401
@@ -0,0 +1,65 @@
+from sqlalchemy import text
+
+from db import base
+
+# chave do advisory lock que serializa o init_db entre workers
+INIT_DB_LOCK_ID = 8675309
+
+
+def _ensure_plant_area_fk(conn):
+    """
+    plants.area_id passou a ser ON DELETE SET NULL; ajusta a constraint
+    de bancos criados antes da mudança (create_all não altera tabelas existentes).
+    """
+    on_delete = conn.execute(text("""
+        SELECT confdeltype FROM pg_constraint
+        WHERE conrelid = 'plants'::regclass AND conname = 'plants_area_id_fkey'
+    """)).scalar()
+
+    # 'n' = SET NULL
+    if on_delete is not None and on_delete != "n":
+        conn.execute(text("""
+            ALTER TABLE plants
+                DROP CONSTRAINT plants_area_id_fkey,
+                ADD CONSTRAINT plants_area_id_fkey
+                    FOREIGN KEY (area_id) REFERENCES areas (id) ON DELETE SET NULL
+        """))
+
+
+def _create_schema(engine):
+    base.Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        # create_all só cria índices de tabelas novas; garante os índices em bancos existentes
+        for table in base.Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+        # substituído por ix_obs_plant_date_desc
+        conn.execute(text("DROP INDEX IF EXISTS ix_obs_plant_date"))
+
+        _ensure_plant_area_fk(conn)
+
+
+def init_db(engine):
+    """
+    Cria as tabelas e aplica os ajustes de schema em bancos existentes
+    (útil para desenvolvimento; para produção prefira Alembic).
+
+    Só um worker faz o trabalho: os outros esperam ele terminar e seguem sem repetir o DDL.
+    """
+    with engine.connect() as lock_conn:
+        locked = lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(:id)"), {"id": INIT_DB_LOCK_ID}
+        ).scalar()
+
+        if not locked:
+            # outro worker está criando o schema; espera terminar para não subir sem as tabelas
+            lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": INIT_DB_LOCK_ID})
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": INIT_DB_LOCK_ID})
+            return
+
+        try:
+            _create_schema(engine)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": INIT_DB_LOCK_ID})
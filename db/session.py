@@ -1,7 +1,51 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
 
 from core.config import settings
 
-engine = create_engine(settings.db_url, echo=False, future=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    settings.db_url,
+    echo=False,
+    future=True,
+    pool_size=settings.SQLALCHEMY_POOL_SIZE,
+    max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
+    pool_timeout=settings.SQLALCHEMY_POOL_TIMEOUT,
+    pool_recycle=settings.SQLALCHEMY_POOL_RECYCLE,
+    pool_pre_ping=True,  # descarta conexões derrubadas pelo provedor antes de usar
+    # INSERTs em lote viram um único VALUES (...), (...); UPDATE/DELETE usam execute_batch
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    executemany_batch_page_size=500,
+    # mantém a sessão TCP viva atrás do NAT do provedor
+    connect_args={"keepalives": 1, "keepalives_idle": 30, "keepalives_interval": 10},
+)
+# expire_on_commit=False: objetos já carregados continuam válidos depois do commit
+# (sem SELECT extra ao serializar a resposta)
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+    future=True
+)
+
+
+def wait_for_db(engine, timeout: float = 30) -> None:
+    """
+    Espera o Postgres aceitar conexões, tentando um SELECT 1 com backoff exponencial.
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return
+        except OperationalError:
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Banco de dados indisponível após {timeout}s")
+            time.sleep(min(0.1 * 2 ** attempt, 2))
+            attempt += 1
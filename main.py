@@ -1,21 +1,49 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import configure_mappers
 from routes.router import api_router
 from core.config import settings
-from models.site import Site
-from models.observation import Observation
-from models.plant import Plant
-from models.area import Area, AreaCoordinate
+from core.logging import setup_logging
+
+from db.async_session import async_engine
+from db.init_db import init_db
+from db.session import engine, wait_for_db
+
+# handlers de log configurados uma vez para toda a aplicação
+setup_logging()
+
+# espera o Postgres responder em vez de dormir um tempo fixo
+wait_for_db(engine)
+
+# cria as tabelas/índices (útil para desenvolvimento; para produção prefira Alembic)
+if settings.RUN_MIGRATIONS:
+    init_db(engine)
 
-from db import base  # noqa: F401
-from db.session import engine
-import time
+# configura os relacionamentos dos models agora, e não na primeira requisição
+configure_mappers()
 
-# cria todas as tabelas (útil para desenvolvimento; para produção prefira Alembic)
-time.sleep(5)
-base.Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Backend FastAPI + Postgres")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # abre a conexão com a OpenAI antes da primeira requisição de chat
+    if settings.OPENAI_API_KEY:
+        from services.openai_service import OpenAIService
+
+        await OpenAIService.warmup(settings.OPENAI_API_KEY)
+    yield
+    # fecha as conexões asyncpg do pool das rotas de áreas
+    await async_engine.dispose()
+
+
+# orjson serializa as respostas (áreas com plantas/observações) bem mais rápido que o json padrão
+app = FastAPI(
+    title="Backend FastAPI + Postgres",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Configurar CORS para o frontend acessar
 app.add_middleware(
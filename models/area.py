@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, String
+from sqlalchemy import Column, Integer, Float, ForeignKey, String, Index
 from sqlalchemy.orm import relationship
 from db.base import Base
 
@@ -11,11 +11,17 @@ class Area(Base):
     coordinates = relationship("AreaCoordinate", back_populates="area", cascade="all, delete-orphan")
 
     # relacionamento com Plant (uma área tem várias plantas)
-    plants = relationship("Plant", back_populates="area")
+    # o banco zera plants.area_id ao deletar a área (ON DELETE SET NULL)
+    # ordem fixa: o prompt de uma área sai sempre igual (cache de prompt da OpenAI)
+    plants = relationship("Plant", back_populates="area", passive_deletes=True, order_by="Plant.id")
 
 
 class AreaCoordinate(Base):
     __tablename__ = "area_coordinates"
+    __table_args__ = (
+        # coordenadas sempre são buscadas por área na ordem do polígono
+        Index("ix_area_coordinates_area_order", "area_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     area_id = Column(Integer, ForeignKey("areas.id"), nullable=False)
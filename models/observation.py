@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey, Boolean, String
+from sqlalchemy import Column, Integer, Date, ForeignKey, Boolean, String, Index, text
 from sqlalchemy.orm import relationship
 from db.base import Base
 
 class Observation(Base):
     __tablename__ = "observations"
+    __table_args__ = (
+        # observações de uma planta/site sempre são buscadas ordenadas por data
+        # (por planta, da mais recente para a mais antiga: vira index scan sem Sort)
+        Index("ix_obs_plant_date_desc", "plant_id", text("observation_date DESC")),
+        Index("ix_obs_site_date", "site_id", "observation_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     site_id = Column(Integer, ForeignKey("sites.id"), nullable=False)
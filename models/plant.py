@@ -7,7 +7,7 @@ class Plant(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     site_id = Column(Integer, ForeignKey("sites.id"), nullable=False)
-    area_id = Column(Integer, ForeignKey("areas.id"), nullable=True)
+    area_id = Column(Integer, ForeignKey("areas.id", ondelete="SET NULL"), nullable=True)
     species = Column(String, nullable=False)
     description = Column(String, nullable=True)
     # relacionamento com Observation (uma planta tem várias observações)
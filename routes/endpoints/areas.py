@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from typing import List
 import logging
+import orjson
 
-from db.session import SessionLocal
+from db.async_session import AsyncSessionLocal, async_engine
 from models.area import Area, AreaCoordinate
 from models.plant import Plant
-from schemas.area import AreaCreate, AreaResponse, AreaListResponse, AreaChatRequest, AreaChatResponse
-from services.openai_service import OpenAIService
-from core.config import settings
+from models.observation import Observation
+from schemas.area import (
+    AreaCreate, AreaResponse, AreaListResponse, AreaCoordinateResponse,
+    AreaChatRequest, AreaChatResponse
+)
+from services.area_cache import AreaPayloadCache
+from services.observations import lazy_load_guard, load_monthly_observations
+from core.config import Settings, current_settings, get_settings
 
 from collections import defaultdict
 
@@ -16,187 +25,363 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# JSON pronto de GET /areas/{id}, invalidado pela versão dos dados da área
+area_cache = AreaPayloadCache(maxsize=get_settings().AREA_CACHE_SIZE)
+
+# Configurações fixas do chat sobre áreas
+CHAT_MODEL = "gpt-3.5-turbo"
+CHAT_TEMPERATURE = 0.7
+CHAT_MAX_TOKENS = 500
+
+# Áreas com geração de descrição em andamento neste worker; entre workers quem evita
+# gerar duas vezes é o advisory lock da task (_DESCRIPTION_LOCK, area_id)
+_pending_descriptions = set()
+# Namespace do pg_advisory_lock(classid, objid) das descrições de área
+_DESCRIPTION_LOCK = 1
+
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncSession:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@router.post("/", response_model=AreaResponse, status_code=status.HTTP_201_CREATED)
-def create_area(area_data: AreaCreate, db: Session = Depends(get_db)):
+def _build_area_data(area: Area) -> dict:
     """
-    Cria uma nova área com suas coordenadas (polígono)
+    Dicionário da área enviado à OpenAI (coordenadas, plantas, site e observações
+    já filtradas), gerado pelos próprios schemas de resposta a partir do ORM.
     """
-    # Criar a área
-    new_area = Area()
-    db.add(new_area)
-    db.flush()  # Para obter o ID
-
-    # Adicionar coordenadas
-    for coord_data in area_data.coordinates:
-        coordinate = AreaCoordinate(
-            area_id=new_area.id,
-            latitude=coord_data.latitude,
-            longitude=coord_data.longitude,
-            order=coord_data.order
+    return AreaResponse.model_validate(area).model_dump(exclude={"description"})
+
+
+async def _area_version(db: AsyncSession, area_id: int):
+    """
+    Consulta barata (agregados sobre os índices) que identifica o estado atual de uma área.
+    Retorna None se a área não existe.
+    """
+    result = await db.execute(
+        select(
+            Area.description.isnot(None).label("has_description"),
+            func.count(func.distinct(Plant.id)).label("plants"),
+            func.count(Observation.observation_date).label("observations"),
+            func.max(Observation.observation_date).label("last_observation")
         )
-        db.add(coordinate)
+        .select_from(Area)
+        .outerjoin(Plant, Plant.area_id == Area.id)
+        .outerjoin(Observation, Observation.plant_id == Plant.id)
+        .where(Area.id == area_id)
+        .group_by(Area.id)
+    )
+    return result.first()
+
+
+async def _get_area_with_plants(db: AsyncSession, area_id: int):
+    """
+    Busca a área com coordenadas, plantas e sites já carregados
+    (AsyncSession não faz lazy load). Retorna None se a área não existe.
+    """
+    result = await db.execute(
+        select(Area).options(
+            lazy_load_guard(selectinload(Area.coordinates)),
+            selectinload(Area.plants).options(
+                lazy_load_guard(joinedload(Plant.site)),
+                # observations é preenchida depois por services.observations.load_monthly_observations
+                lazy_load_guard()
+            ),
+            lazy_load_guard()
+        ).where(Area.id == area_id)
+    )
+    return result.unique().scalar_one_or_none()
+
+
+async def _load_area_data(db: AsyncSession, area_id: int):
+    """
+    Busca a área com plantas, sites e observações mensais e monta o dicionário para a IA.
+    Retorna None se a área não existe.
+    """
+    area = await _get_area_with_plants(db, area_id)
+
+    if not area:
+        return None
+
+    # Até 1 observação por planta por mês (máx 12 meses), selecionadas no banco
+    await load_monthly_observations(db, area.plants)
+
+    return _build_area_data(area)
+
+
+async def _generate_and_save_description(area_id: int, area_data: dict, api_key: str):
+    """
+    Gera a descrição da área com a OpenAI e salva no banco.
+    Roda como background task, com conexão própria, depois da resposta ser enviada.
+    """
+    # Import tardio: o SDK da OpenAI só é carregado quando precisa gerar
+    from services.openai_service import OpenAIService
+
+    # Entra no conjunto só quando a task roda de fato: se o Starlette não executar a
+    # task (ex.: cliente desconectou antes da resposta), o id não fica preso nele
+    if area_id in _pending_descriptions:
+        return
+    _pending_descriptions.add(area_id)
+
+    try:
+        # Advisory lock numa conexão própria, segurado durante toda a geração: outro
+        # worker que tente a mesma área desiste na hora. Não trava a linha da área
+        # (delete_area e updates seguem livres) e nenhuma transação fica aberta
+        # enquanto a OpenAI responde
+        async with async_engine.connect() as conn:
+            claimed = await conn.scalar(select(func.pg_try_advisory_lock(_DESCRIPTION_LOCK, area_id)))
+            await conn.commit()
+            if not claimed:
+                return
+
+            try:
+                # Com o lock em mãos, confere se outro worker já salvou a descrição
+                pending = await conn.scalar(
+                    select(Area.id).where(Area.id == area_id, Area.description.is_(None))
+                )
+                await conn.commit()
+                if pending is None:
+                    return
+
+                logger.info(f"Gerando descrição para área {area_id}")
+
+                description = await OpenAIService.generate_area_description(
+                    api_key=api_key,
+                    area_data=area_data
+                )
 
-    db.commit()
-    db.refresh(new_area)
+                # Grava só se a descrição continua vazia (ex.: área editada nesse meio tempo)
+                await conn.execute(
+                    update(Area)
+                    .where(Area.id == area_id, Area.description.is_(None))
+                    .values(description=description)
+                )
+                await conn.commit()
 
-    # Carregar com relacionamentos
-    area = db.query(Area).options(
-        joinedload(Area.coordinates),
-        joinedload(Area.plants)
-            .joinedload(Plant.site),
-        joinedload(Area.plants)
-            .joinedload(Plant.observations)
-    ).filter(Area.id == new_area.id).first()
+                logger.info(f"Descrição gerada e salva com sucesso para área {area_id}")
+            finally:
+                # A conexão volta para o pool: o lock não pode ir junto. Se não der para
+                # liberar, a conexão é descartada (fechar a sessão solta o lock)
+                try:
+                    await conn.rollback()
+                    await conn.scalar(select(func.pg_advisory_unlock(_DESCRIPTION_LOCK, area_id)))
+                    await conn.commit()
+                except Exception:
+                    await conn.invalidate()
+                    raise
 
-    return area
+    except Exception as e:
+        logger.error(f"Erro ao gerar descrição para área {area_id}: {str(e)}")
+
+    finally:
+        _pending_descriptions.discard(area_id)
+
+
+@router.post("/", response_model=AreaResponse, status_code=status.HTTP_201_CREATED)
+async def create_area(area_data: AreaCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Cria uma nova área com suas coordenadas (polígono)
+    """
+    # Criar a área (INSERT ... RETURNING id, sem passar pelo unit of work)
+    area_id = (await db.execute(insert(Area).returning(Area.id))).scalar_one()
+
+    # Adicionar coordenadas em um único INSERT multi-linha, recebendo os IDs na mesma ordem
+    coordinates = area_data.coordinates
+    coordinate_ids = []
+    if coordinates:
+        result = await db.execute(
+            insert(AreaCoordinate).returning(AreaCoordinate.id, sort_by_parameter_order=True),
+            [
+                {
+                    "area_id": area_id,
+                    "latitude": coord_data.latitude,
+                    "longitude": coord_data.longitude,
+                    "order": coord_data.order
+                }
+                for coord_data in coordinates
+            ]
+        )
+        coordinate_ids = result.scalars().all()
+
+    await db.commit()
+
+    # Acabamos de gravar tudo: monta a resposta sem recarregar do banco
+    # (uma área nova ainda não tem plantas nem descrição)
+    return AreaResponse(
+        id=area_id,
+        description=None,
+        coordinates=[
+            AreaCoordinateResponse(
+                id=coord_id,
+                latitude=coord_data.latitude,
+                longitude=coord_data.longitude,
+                order=coord_data.order
+            )
+            for coord_id, coord_data in zip(coordinate_ids, coordinates)
+        ],
+        plants=[]
+    )
 
 
 @router.get("/", response_model=List[AreaListResponse])
 @router.get("/areas/", response_model=List[AreaListResponse])
-def list_areas(db: Session = Depends(get_db)):
-    areas = db.query(Area).all()
-    return [AreaListResponse.from_orm(area) for area in areas]
+async def list_areas(db: AsyncSession = Depends(get_db)):
+    """
+    Lista as áreas com suas coordenadas.
+    Usa duas consultas só com as colunas necessárias (sem N+1 nem instâncias ORM).
+    """
+    areas = (await db.execute(
+        select(Area.id, Area.description).order_by(Area.id)
+    )).all()
+    coordinates = (await db.execute(
+        select(
+            AreaCoordinate.area_id,
+            AreaCoordinate.id,
+            AreaCoordinate.latitude,
+            AreaCoordinate.longitude,
+            AreaCoordinate.order
+        ).order_by(AreaCoordinate.area_id, AreaCoordinate.order)
+    )).all()
+
+    # Dicts simples: o response_model valida e serializa a lista uma única vez
+    coords_by_area = defaultdict(list)
+    for coord in coordinates:
+        coords_by_area[coord.area_id].append({
+            "id": coord.id,
+            "latitude": coord.latitude,
+            "longitude": coord.longitude,
+            "order": coord.order
+        })
+
+    return [
+        {
+            "id": area.id,
+            "description": area.description,
+            "coordinates": coords_by_area[area.id]
+        }
+        for area in areas
+    ]
 
 
 
 @router.get("/{area_id}", response_model=AreaResponse)
-def get_area(area_id: int, db: Session = Depends(get_db)):
+async def get_area(
+    area_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    settings: Settings = Depends(current_settings)
+):
     """
     Retorna uma área específica com:
     - Coordenadas do polígono
     - Plantas da área
     - Site de cada planta (lat/long)
     - Até 1 observação por planta por mês (máx 12 meses)
-    - Descrição gerada por IA (gera automaticamente se não existir)
+    - Descrição gerada por IA (se não existir, é gerada em segundo plano
+      e aparece nas próximas consultas)
     """
-    area = db.query(Area).options(
-        joinedload(Area.coordinates),
-        joinedload(Area.plants)
-            .joinedload(Plant.site),
-        joinedload(Area.plants)
-            .joinedload(Plant.observations)
-    ).filter(Area.id == area_id).first()
+    version = await _area_version(db, area_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Área não encontrada")
+
+    # Sem mudanças desde a última consulta: devolve o JSON já pronto
+    cached = area_cache.get(area_id, version)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    area = await _get_area_with_plants(db, area_id)
 
     if not area:
         raise HTTPException(status_code=404, detail="Área não encontrada")
 
-    for plant in area.plants:
-        # Agrupa observações por ano/mês
-        month_dict = defaultdict(list)
-        for obs in plant.observations:
-            ym = (obs.observation_date.year, obs.observation_date.month)
-            month_dict[ym].append(obs)
-
-        # Seleciona a observação mais recente de cada mês
-        monthly_obs = [max(obs_list, key=lambda o: o.observation_date)
-                       for obs_list in month_dict.values()]
+    # Até 1 observação por planta por mês (máx 12 meses), selecionadas no banco
+    await load_monthly_observations(db, area.plants)
 
-        # Ordena do mais recente ao mais antigo e limita a 12 meses
-        plant.observations = sorted(monthly_obs, key=lambda o: o.observation_date, reverse=True)[:12]
+    # Percorre o grafo ORM uma única vez; resposta e dados da IA saem daqui
+    response = AreaResponse.model_validate(area)
 
-    # Gera descrição automaticamente se não existir
+    # Agenda a geração da descrição sem bloquear a resposta
     if not area.description:
-        try:
-            logger.info(f"Gerando descrição para área {area_id}")
-            
-            # Verifica se a API key está configurada
-            if not settings.OPENAI_API_KEY:
-                logger.warning("OPENAI_API_KEY não configurada - descrição não será gerada")
-            else:
-                # Prepara os dados da área para enviar à IA
-                area_data = {
-                    "id": area.id,
-                    "coordinates": [
-                        {
-                            "latitude": coord.latitude,
-                            "longitude": coord.longitude,
-                            "order": coord.order,
-                            "id": coord.id
-                        }
-                        for coord in area.coordinates
-                    ],
-                    "plants": [
-                        {
-                            "species": plant.species,
-                            "id": plant.id,
-                            "site_id": plant.site_id,
-                            "area_id": plant.area_id,
-                            "site": {
-                                "latitude": plant.site.latitude,
-                                "longitude": plant.site.longitude,
-                                "elevation": plant.site.elevation,
-                                "id": plant.site.id
-                            },
-                            "observations": [
-                                {
-                                    "phenophase_id": obs.phenophase_id,
-                                    "observation_date": obs.observation_date.isoformat(),
-                                    "is_blooming": obs.is_blooming,
-                                    "description": obs.description,
-                                    "id": obs.id,
-                                    "site_id": obs.site_id,
-                                    "plant_id": obs.plant_id
-                                }
-                                for obs in plant.observations
-                            ]
-                        }
-                        for plant in area.plants
-                    ]
-                }
-                
-                # Gera a descrição usando o serviço OpenAI
-                description = OpenAIService.generate_area_description(
-                    api_key=settings.OPENAI_API_KEY,
-                    area_data=area_data
-                )
-                
-                # Salva a descrição no banco de dados
-                area.description = description
-                db.commit()
-                db.refresh(area)
-                
-                logger.info(f"Descrição gerada e salva com sucesso para área {area_id}")
-                
-        except Exception as e:
-            logger.error(f"Erro ao gerar descrição para área {area_id}: {str(e)}")
-            # Não falha a requisição se houver erro na geração da descrição
-            # A área será retornada sem descrição
+        if not settings.OPENAI_API_KEY:
+            logger.warning("OPENAI_API_KEY não configurada - descrição não será gerada")
+        elif area_id not in _pending_descriptions:
+            background_tasks.add_task(
+                _generate_and_save_description,
+                area_id,
+                response.model_dump(exclude={"description"}),
+                settings.OPENAI_API_KEY
+            )
+        # A descrição ainda vai mudar, então não vale a pena guardar no cache
+        return response
+
+    payload = orjson.dumps(response.model_dump())
+    area_cache.set(area_id, version, payload)
 
-    return area
+    return Response(content=payload, media_type="application/json")
 
 @router.delete("/{area_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_area(area_id: int, db: Session = Depends(get_db)):
+async def delete_area(area_id: int, db: AsyncSession = Depends(get_db)):
     """
-    Deleta uma área (as coordenadas são deletadas automaticamente por cascade)
+    Deleta uma área (as coordenadas são deletadas automaticamente por cascade
+    e o area_id das plantas é zerado pelo banco via ON DELETE SET NULL)
     """
-    area = db.query(Area).filter(Area.id == area_id).first()
+    # O cascade do ORM precisa das coordenadas carregadas (sem lazy load no async)
+    result = await db.execute(
+        select(Area).options(selectinload(Area.coordinates)).where(Area.id == area_id)
+    )
+    area = result.scalar_one_or_none()
 
     if not area:
         raise HTTPException(status_code=404, detail="Área não encontrada")
 
-    # Remove area_id das plantas antes de deletar
-    db.query(Plant).filter(Plant.area_id == area_id).update({"area_id": None})
-
-    db.delete(area)
-    db.commit()
+    await db.delete(area)
+    await db.commit()
+    area_cache.discard(area_id)
 
     return None
 
 
+def _validate_question(chat_request: AreaChatRequest) -> None:
+    """Levanta 400 se a pergunta estiver vazia."""
+    if not chat_request.question or not chat_request.question.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A pergunta não pode estar vazia"
+        )
+
+
+def _chat_api_key(settings: Settings) -> str:
+    """
+    API key do chat de áreas (sempre a do .env).
+    Levanta 500 se não estiver configurada ou tiver formato inválido.
+    """
+    from services.openai_service import OpenAIService
+
+    api_key = settings.OPENAI_API_KEY
+
+    if not api_key:
+        logger.warning("API key não configurada no .env")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Serviço não configurado. OPENAI_API_KEY não encontrada no servidor."
+        )
+
+    if not OpenAIService.validate_api_key(api_key):
+        logger.warning("API key configurada no .env é inválida")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Serviço mal configurado. API key inválida no servidor."
+        )
+
+    return api_key
+
+
 @router.post("/{area_id}/chat", response_model=AreaChatResponse, status_code=status.HTTP_200_OK)
-def chat_about_area(
+async def chat_about_area(
     area_id: int, 
     chat_request: AreaChatRequest, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    settings: Settings = Depends(current_settings)
 ):
     """
     Permite fazer perguntas sobre uma área específica.
@@ -216,112 +401,32 @@ def chat_about_area(
     """
     try:
         # Busca a área com todos os dados necessários
-        area = db.query(Area).options(
-            joinedload(Area.coordinates),
-            joinedload(Area.plants)
-                .joinedload(Plant.site),
-            joinedload(Area.plants)
-                .joinedload(Plant.observations)
-        ).filter(Area.id == area_id).first()
-
-        if not area:
+        area_data = await _load_area_data(db, area_id)
+
+        if area_data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Área com ID {area_id} não encontrada"
             )
 
-        # Validação da pergunta
-        if not chat_request.question or not chat_request.question.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A pergunta não pode estar vazia"
-            )
-
-        # Usa sempre a API key do .env
-        api_key = settings.OPENAI_API_KEY
-        
-        # Validação da API key
-        if not api_key:
-            logger.warning("API key não configurada no .env")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Serviço não configurado. OPENAI_API_KEY não encontrada no servidor."
-            )
-        
-        if not OpenAIService.validate_api_key(api_key):
-            logger.warning("API key configurada no .env é inválida")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Serviço mal configurado. API key inválida no servidor."
-            )
-
-        # Prepara os dados da área (similar ao get_area para descrição)
-        # Agrupa observações por mês
-        for plant in area.plants:
-            month_dict = defaultdict(list)
-            for obs in plant.observations:
-                ym = (obs.observation_date.year, obs.observation_date.month)
-                month_dict[ym].append(obs)
-
-            # Seleciona a observação mais recente de cada mês
-            monthly_obs = [max(obs_list, key=lambda o: o.observation_date)
-                           for obs_list in month_dict.values()]
+        _validate_question(chat_request)
+        api_key = _chat_api_key(settings)
 
-            # Ordena do mais recente ao mais antigo e limita a 12 meses
-            plant.observations = sorted(monthly_obs, key=lambda o: o.observation_date, reverse=True)[:12]
-
-        # Prepara os dados da área para enviar à IA
-        area_data = {
-            "id": area.id,
-            "coordinates": [
-                {
-                    "latitude": coord.latitude,
-                    "longitude": coord.longitude,
-                    "order": coord.order,
-                    "id": coord.id
-                }
-                for coord in area.coordinates
-            ],
-            "plants": [
-                {
-                    "species": plant.species,
-                    "id": plant.id,
-                    "site_id": plant.site_id,
-                    "area_id": plant.area_id,
-                    "site": {
-                        "latitude": plant.site.latitude,
-                        "longitude": plant.site.longitude,
-                        "elevation": plant.site.elevation,
-                        "id": plant.site.id
-                    },
-                    "observations": [
-                        {
-                            "phenophase_id": obs.phenophase_id,
-                            "observation_date": obs.observation_date.isoformat(),
-                            "is_blooming": obs.is_blooming,
-                            "description": obs.description,
-                            "id": obs.id,
-                            "site_id": obs.site_id,
-                            "plant_id": obs.plant_id
-                        }
-                        for obs in plant.observations
-                    ]
-                }
-                for plant in area.plants
-            ]
-        }
+        from services.openai_service import OpenAIService
 
         logger.info(f"Processando pergunta sobre área {area_id}: {chat_request.question[:50]}...")
 
         # Chama o serviço OpenAI para responder a pergunta
-        # Usa configurações padrão fixas
-        result = OpenAIService.answer_area_question(
+        # Usa configurações padrão fixas; mesma pergunta sobre os mesmos dados
+        # reaproveita a resposta do cache (cache=True)
+        result = await OpenAIService.answer_area_question(
             api_key=api_key,
             area_data=area_data,
             question=chat_request.question,
-            model="gpt-3.5-turbo",
-            temperature=0.7,
-            max_tokens=500
+            model=CHAT_MODEL,
+            temperature=CHAT_TEMPERATURE,
+            max_tokens=CHAT_MAX_TOKENS,
+            cache=True
         )
 
         # Retorna a resposta
@@ -340,17 +445,72 @@ def chat_about_area(
         logger.error(f"Erro ao processar chat sobre área {area_id}: {str(e)}")
         
         # Mensagem de erro amigável para o usuário
-        error_message = str(e)
-        if "api_key" in error_message.lower():
-            detail = "API key rejeitada pela OpenAI. Verifique se a chave está correta e ativa."
-        elif "rate_limit" in error_message.lower():
-            detail = "Limite de requisições excedido. Tente novamente em alguns instantes."
-        elif "insufficient_quota" in error_message.lower():
-            detail = "Quota da API key excedida. Verifique seu saldo na OpenAI."
-        else:
-            detail = f"Erro ao processar pergunta: {error_message}"
-        
+        from services.openai_service import openai_error_detail
+
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=detail
+            detail=openai_error_detail(e, "Erro ao processar pergunta")
+        )
+
+
+@router.post("/{area_id}/chat/stream", status_code=status.HTTP_200_OK)
+async def stream_chat_about_area(
+    area_id: int,
+    chat_request: AreaChatRequest,
+    db: AsyncSession = Depends(get_db),
+    settings: Settings = Depends(current_settings)
+):
+    """
+    Mesma pergunta de /{area_id}/chat, mas a resposta chega em partes
+    (Server-Sent Events) conforme a IA gera o texto.
+    
+    Cada evento traz `data: {"text": "..."}`; o fim é sinalizado por `event: done`
+    e uma falha no meio da resposta por `event: error` com `{"detail": "..."}`.
+    
+    Args:
+        area_id: ID da área sobre a qual fazer a pergunta
+        chat_request: Objeto contendo a pergunta
+        
+    Returns:
+        StreamingResponse (text/event-stream)
+        
+    Raises:
+        HTTPException: 404 se a área não for encontrada
+        HTTPException: 400 se a pergunta estiver vazia
+        HTTPException: 500 se a API key do servidor não estiver configurada
+    """
+    area_data = await _load_area_data(db, area_id)
+
+    if area_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Área com ID {area_id} não encontrada"
         )
+
+    _validate_question(chat_request)
+    api_key = _chat_api_key(settings)
+
+    from services.openai_service import OpenAIService, openai_error_detail
+
+    logger.info(f"Processando pergunta (streaming) sobre área {area_id}: {chat_request.question[:50]}...")
+
+    async def events():
+        try:
+            async for text in OpenAIService.stream_area_answer(
+                api_key=api_key,
+                area_data=area_data,
+                question=chat_request.question,
+                model=CHAT_MODEL,
+                temperature=CHAT_TEMPERATURE,
+                max_tokens=CHAT_MAX_TOKENS,
+                cache=True
+            ):
+                yield b"data: " + orjson.dumps({"text": text}) + b"\n\n"
+            yield b"event: done\ndata: {}\n\n"
+        except Exception as e:
+            # O status 200 já foi enviado: o erro vai como evento
+            logger.error(f"Erro ao processar chat (streaming) sobre área {area_id}: {str(e)}")
+            detail = openai_error_detail(e, "Erro ao processar pergunta")
+            yield b"event: error\ndata: " + orjson.dumps({"detail": detail}) + b"\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -1,13 +1,10 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from typing import Dict
 import logging
 
 from schemas.openai_chat import ChatRequest, ChatResponse, ErrorResponse
-from services.openai_service import OpenAIService
-from core.config import settings
+from core.config import Settings, current_settings
 
-# Configuração de logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -34,7 +31,10 @@ router = APIRouter()
         }
     }
 )
-async def chat_with_openai(request: ChatRequest) -> ChatResponse:
+async def chat_with_openai(
+    request: ChatRequest,
+    settings: Settings = Depends(current_settings)
+) -> ChatResponse:
     """
     Endpoint para chat com OpenAI GPT-3.5 Turbo.
     
@@ -61,6 +61,9 @@ async def chat_with_openai(request: ChatRequest) -> ChatResponse:
         HTTPException: 400 se a API key for inválida
         HTTPException: 500 se houver erro na comunicação com OpenAI
     """
+    # Import tardio: o SDK da OpenAI só é carregado na primeira requisição de chat
+    from services.openai_service import OpenAIService, openai_error_detail
+
     try:
         # Define a API key: usa a do request ou a do .env
         api_key = request.api_key or settings.OPENAI_API_KEY
@@ -98,8 +101,8 @@ async def chat_with_openai(request: ChatRequest) -> ChatResponse:
         
         logger.info(f"Processando requisição de chat - Modelo: {request.model}")
         
-        # Chama o service para processar a requisição
-        result = OpenAIService.create_chat_completion(
+        # Chama o service para processar a requisição (sem bloquear o event loop)
+        result = await OpenAIService.create_chat_completion(
             api_key=api_key,
             message=request.message,
             model=request.model,
@@ -120,19 +123,9 @@ async def chat_with_openai(request: ChatRequest) -> ChatResponse:
         logger.error(f"Erro ao processar chat: {str(e)}")
         
         # Mensagem de erro amigável para o usuário
-        error_message = str(e)
-        if "api_key" in error_message.lower():
-            detail = "API key rejeitada pela OpenAI. Verifique se a chave está correta e ativa."
-        elif "rate_limit" in error_message.lower():
-            detail = "Limite de requisições excedido. Tente novamente em alguns instantes."
-        elif "insufficient_quota" in error_message.lower():
-            detail = "Quota da API key excedida. Verifique seu saldo na OpenAI."
-        else:
-            detail = f"Erro ao processar requisição com a OpenAI: {error_message}"
-        
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=detail
+            detail=openai_error_detail(e, "Erro ao processar requisição com a OpenAI")
         )
 
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import date
 
@@ -15,8 +15,7 @@ class ObservationResponse(ObservationBase):
     plant_id: int
     description: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Schemas para Site
@@ -28,8 +27,7 @@ class SiteBase(BaseModel):
 class SiteResponse(SiteBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Schemas para Plant
@@ -43,8 +41,7 @@ class PlantWithObservations(PlantBase):
     site: SiteResponse
     observations: List[ObservationResponse]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Schemas para AreaCoordinate
@@ -56,9 +53,7 @@ class AreaCoordinateBase(BaseModel):
 class AreaCoordinateResponse(AreaCoordinateBase):
     id: int
 
-    class Config:
-        orm_mode = True
-        extra = "ignore"
+    model_config = ConfigDict(from_attributes=True)
 
 
 
@@ -72,8 +67,7 @@ class AreaResponse(BaseModel):
     coordinates: List[AreaCoordinateResponse]
     plants: List[PlantWithObservations]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 
@@ -82,9 +76,7 @@ class AreaListResponse(BaseModel):
     coordinates: List[AreaCoordinateResponse]
     description: Optional[str] = None
 
-    class Config:
-        orm_mode = True
-        extra = "ignore"
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Schemas para Chat de Áreas
@@ -0,0 +1,32 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class AreaPayloadCache:
+    """
+    Cache LRU em memória do JSON já serializado de GET /areas/{id}.
+    Cada área guarda uma única entrada junto com a versão dos seus dados;
+    quando a versão muda a entrada antiga simplesmente deixa de ser usada.
+    Usado só pelas rotas async, no event loop: nenhum método tem await no meio,
+    então não há acesso concorrente e não precisa de trava.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def get(self, area_id: int, version: Hashable) -> Optional[bytes]:
+        entry = self._entries.get(area_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(area_id)
+        return entry[1]
+
+    def set(self, area_id: int, version: Hashable, payload: bytes) -> None:
+        self._entries[area_id] = (version, payload)
+        self._entries.move_to_end(area_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, area_id: int) -> None:
+        self._entries.pop(area_id, None)
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Gera a chave do cache a partir das partes da requisição (dados da área, pergunta, modelo...).
+    Dicionários/listas são serializados com chaves ordenadas para a chave ser estável.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, (dict, list)):
+            data = json.dumps(part, sort_keys=True, default=str).encode()
+        else:
+            data = str(part).encode()
+        digest.update(data)
+        digest.update(b"\x00")  # separador: ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """
+    Cache de respostas da OpenAI com TTL.
+    L1 em memória (por processo) e, se `redis_url` for informada, L2 no Redis
+    (compartilhado entre workers). Falhas no Redis não derrubam a requisição.
+    """
+
+    def __init__(self, ttl: int = 3600, maxsize: int = 1024, redis_url: Optional[str] = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+        self._redis = None
+
+        if redis_url:
+            import redis.asyncio as redis  # só é necessário quando o Redis está configurado
+
+            self._redis = redis.Redis.from_url(redis_url)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+        if self._redis is None:
+            return None
+
+        try:
+            raw = await self._redis.get(f"llm:{key}")
+        except Exception as e:
+            logger.warning(f"Erro ao ler cache no Redis: {str(e)}")
+            return None
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        self._set_local(key, value)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        self._set_local(key, value)
+
+        if self._redis is not None:
+            try:
+                await self._redis.setex(f"llm:{key}", self.ttl, json.dumps(value))
+            except Exception as e:
+                logger.warning(f"Erro ao gravar cache no Redis: {str(e)}")
+
+    def _set_local(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
@@ -0,0 +1,64 @@
+from collections import defaultdict
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from core.config import get_settings
+from models.observation import Observation
+
+
+def lazy_load_guard(path=None):
+    """
+    Opção de loader para as relações que a consulta não carregou explicitamente
+    (a partir de `path`, se informado): nunca geram SELECT extra.
+    raiseload levanta erro ao acessar; noload devolve vazio.
+    """
+    if get_settings().ORM_RAISELOAD:
+        return path.raiseload("*") if path is not None else raiseload("*")
+    return path.noload("*") if path is not None else noload("*")
+
+
+async def load_monthly_observations(db: AsyncSession, plants, months: int = 12):
+    """
+    Carrega em uma única query a observação mais recente de cada mês de cada planta,
+    limitada aos `months` meses mais recentes, e associa a plant.observations.
+    """
+    plant_ids = [plant.id for plant in plants]
+    by_plant = defaultdict(list)
+
+    if plant_ids:
+        month = func.date_trunc("month", Observation.observation_date)
+
+        # Observação mais recente de cada (planta, mês)
+        latest = (
+            select(Observation.id, Observation.plant_id, Observation.observation_date)
+            .where(Observation.plant_id.in_(plant_ids))
+            .distinct(Observation.plant_id, month)
+            .order_by(Observation.plant_id, month.desc(), Observation.observation_date.desc())
+            .subquery()
+        )
+
+        # Numera os meses de cada planta do mais recente ao mais antigo
+        ranked = select(
+            latest.c.id,
+            func.row_number().over(
+                partition_by=latest.c.plant_id,
+                order_by=latest.c.observation_date.desc()
+            ).label("month_rank")
+        ).subquery()
+
+        result = await db.execute(
+            select(Observation)
+            .options(lazy_load_guard())
+            .join(ranked, Observation.id == ranked.c.id)
+            .where(ranked.c.month_rank <= months)
+            .order_by(Observation.plant_id, Observation.observation_date.desc())
+        )
+        for obs in result.scalars():
+            by_plant[obs.plant_id].append(obs)
+
+    # set_committed_value não marca a coleção como alterada (nada é escrito no commit)
+    for plant in plants:
+        set_committed_value(plant, "observations", by_plant[plant.id])
@@ -1,10 +1,247 @@
-from openai import OpenAI
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from openai import (
+    NOT_GIVEN, AsyncOpenAI, AuthenticationError, OpenAIError, PermissionDeniedError, RateLimitError
+)
+from typing import AsyncIterator, List, Dict, Optional, Any
+import asyncio
+import httpx
 import logging
-import json
+import orjson
+import re
+import weakref
+
+from core.config import get_settings
+from services.llm_cache import LLMCache, make_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Pool HTTP compartilhado pelas chamadas à OpenAI: conexões ociosas ficam abertas
+# por 3 min, então chamadas seguidas não repetem o handshake TCP+TLS
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=180.0)
+_HTTP_TIMEOUT = httpx.Timeout(60.0)
+# Novas tentativas do streaming (as chamadas de chat usam OPENAI_MAX_RETRIES)
+_STREAM_MAX_RETRIES = 1
+
+# Chamadas simultâneas à OpenAI por worker (respeita o rate limit da conta).
+# Um semáforo por event loop, criado dentro do loop: no Python 3.9 um Semaphore criado
+# no import fica preso ao loop do import e quebra com asyncio.run() (scripts)
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _concurrency_limit() -> asyncio.Semaphore:
+    """Semáforo de OPENAI_MAX_CONCURRENCY do event loop em execução."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(get_settings().OPENAI_MAX_CONCURRENCY)
+    return semaphore
+
+# Respostas reaproveitáveis, por (modelo, mensagens, temperatura, max_tokens)
+_response_cache = LLMCache(ttl=get_settings().LLM_CACHE_TTL, redis_url=get_settings().REDIS_URL)
+
+# API keys da OpenAI: prefixo 'sk-' e pelo menos 20 caracteres no total
+_API_KEY_RE = re.compile(r"sk-[A-Za-z0-9_\-]{17,}")
+
+# Limpeza das respostas do chat de áreas
+_DROP_QUOTES = str.maketrans('', '', '"\'')
+_WS_RE = re.compile(r"\s+")
+# Versão por trecho (streaming): tira as aspas e troca quebras de linha por espaço
+_STREAM_CLEAN = str.maketrans({'"': None, "'": None, '\n': ' ', '\r': ' '})
+
+
+# Mensagens de sistema fixas, montadas uma vez no import. Nada dinâmico entra aqui:
+# o prefixo idêntico em toda chamada é o que o cache de prompt da OpenAI reaproveita
+_SYS_DESC = {"role": "system", "content": """You are an expert in ecology and botanical data analysis.
+Your task is to analyze phenological data from a plant monitoring area and generate a comprehensive and informative description.
+
+The data includes:
+- Plant species found in the area
+- Elevation data (height in meters)
+- Phenological observations over time (dates, phenophases, blooming status, descriptions)
+
+IMPORTANT INSTRUCTIONS:
+- DO NOT mention latitude or longitude coordinates
+- DO NOT mention any area IDs, identification numbers, or area codes
+- DO NOT say the location or area UNDER ANALYSIS. avoid saying under analysis or area under analysis.
+- DO NOT use phrases like "the area under analysis", "area ID", "in area X", or "area number Y"
+- Start your description naturally, for example: "In the location...", "The observed species...", "In this location...", or "The area..."
+- Only mention elevation/height when relevant
+- Focus on phenological phases (leaf budding, flowering, fruiting, etc.)
+- Analyze flowering patterns and their implications
+- Provide insights about the suitability of the location for planting
+- Follow the structure and writing style of the examples below
+
+EXAMPLE 1:
+"In the analyzed location, most species predominantly showed the beginning of leaf budding, with flowering records restricted to macrophyllum in April. This suggests that flowering is limited or occurs in a concentrated manner in few species, while the majority remains in vegetative phase for much of the year. Despite reduced flowering, consistent leaf growth indicates that the environment offers adequate conditions for plant development, making the location favorable for planting, although it is not characterized by abundant flowering periods."
+
+EXAMPLE 2:
+"The observed species predominantly showed the beginning of leaf budding and ripe fruits, with no flowering records throughout 2024. This indicates that, during the monitored period, the location did not favor expressive flowering periods, but vegetative growth and fruiting proved to be consistent. Thus, the environment is suitable for plant development, although it is not characterized by abundant flowering, being more suitable for those seeking cultivation with leaf growth and fruit production."
+
+The description must be in English and focused on phenological analysis useful for researchers and environmental managers."""}
+
+_SYS_QA = {"role": "system", "content": """You are an expert in ecology, botany, and phenological data analysis.
+Your task is to answer questions about a specific plant monitoring area based on its data.
+
+The data includes:
+- Plant species found in the area
+- Geographic coordinates of the area (polygon)
+- Elevation data (height in meters)
+- Phenological observations over time (dates, phenophases, blooming status, descriptions)
+
+IMPORTANT INSTRUCTIONS:
+- Answer based ONLY on the provided data
+- Be specific and accurate in your responses
+- Focus on phenological information (leaf budding, flowering, fruiting, etc.)
+- Mention specific species when relevant
+- If the data doesn't contain information to answer the question, say so clearly
+- Provide insights about patterns, trends, or ecological significance when appropriate
+- Keep your answers clear, informative, and professional
+- ALWAYS answer in the SAME LANGUAGE as the user's question
+- Write in a natural, conversational style as a single continuous flowing text
+- DO NOT use ANY formatting characters: no **, no -, no #, no bullets, no quotation marks "", no apostrophes '', no backticks ``
+- When mentioning species names, write them directly without any quotes or special characters (e.g., write "the brevifolia species" not "the \"brevifolia\" species")
+- DO NOT use line breaks or paragraph separators (no \n)
+- Write everything as one continuous paragraph
+- Make your answers flow naturally like a conversation
+- Example: Instead of "brevifolia" and "ramosissima" write: brevifolia and ramosissima
+
+Your answers should be helpful for researchers, environmental managers, and anyone interested in understanding the phenological patterns of the area."""}
+
+
+# Campos de cada observação que a IA usa; IDs e chaves estrangeiras ficam de fora
+_OBSERVATION_FIELDS = ("phenophase_id", "observation_date", "is_blooming", "description")
+
+
+def _compact_plants(plants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Reduz as plantas ao que a análise fenológica precisa (espécie, elevação e
+    observações sem IDs nem campos nulos): menos tokens no prompt.
+    """
+    compact = []
+    for plant in plants:
+        site = plant.get("site") or {}
+        entry = {"species": plant.get("species")}
+        if site.get("elevation") is not None:
+            entry["elevation"] = site["elevation"]
+        entry["observations"] = [
+            {k: obs[k] for k in _OBSERVATION_FIELDS if obs.get(k) is not None}
+            for obs in plant.get("observations", [])
+        ]
+        compact.append(entry)
+    return compact
+
+
+def _dump(obj: Any) -> str:
+    """Serializa os dados do prompt com orjson (indentado, como o json.dumps anterior)."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def openai_error_detail(error: Exception, prefix: str) -> str:
+    """
+    Mensagem amigável para o usuário a partir do tipo do erro da OpenAI.
+
+    Args:
+        error: Exceção levantada pelo OpenAIService
+        prefix: Início da mensagem para erros sem tratamento específico
+
+    Returns:
+        Texto para o detail da HTTPException
+    """
+    if isinstance(error, (AuthenticationError, PermissionDeniedError)):
+        return "API key rejeitada pela OpenAI. Verifique se a chave está correta e ativa."
+    if isinstance(error, RateLimitError):
+        if error.code == "insufficient_quota":
+            return "Quota da API key excedida. Verifique seu saldo na OpenAI."
+        return "Limite de requisições excedido. Tente novamente em alguns instantes."
+    return f"{prefix}: {error}"
+
+
+# Janela de contexto (tokens) dos modelos usados; modelos fora da lista não são limitados
+_MODEL_CONTEXT = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+}
+# Tokens extras por mensagem (papel e separadores) e folga para erros da estimativa
+_TOKENS_PER_MESSAGE = 4
+_CONTEXT_SAFETY = 64
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """
+    Tokenizer do modelo (tiktoken), carregado uma vez por modelo.
+    Retorna None se o tiktoken não estiver disponível; aí a contagem é estimada.
+    """
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken indisponível, estimando tokens por caracteres: {str(e)}")
+        return None
+
+
+def _count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """Conta os tokens de um texto (~4 caracteres por token se não houver tiktoken)."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text))
+
+
+def _clamp_max_tokens(
+    model: str, messages: List[Dict[str, str]], max_tokens: Optional[int]
+) -> Optional[int]:
+    """
+    Limita max_tokens ao que cabe na janela de contexto do modelo depois do prompt.
+    max_tokens=None (sem limite pedido) segue como está: a OpenAI usa o que sobra do contexto.
+
+    Raises:
+        Exception: Se o prompt sozinho já não cabe no contexto do modelo
+    """
+    context = _MODEL_CONTEXT.get(model)
+    if context is None or max_tokens is None:
+        return max_tokens
+
+    input_tokens = sum(
+        _count_tokens(msg["content"], model) + _TOKENS_PER_MESSAGE for msg in messages
+    )
+    available = context - input_tokens - _CONTEXT_SAFETY
+    if available <= 0:
+        raise Exception(f"Prompt com {input_tokens} tokens excede o contexto de {model}")
+    if available < max_tokens:
+        logger.warning(f"max_tokens reduzido de {max_tokens} para {available} (prompt com {input_tokens} tokens)")
+        return available
+    return max_tokens
+
+
+@lru_cache(maxsize=8)
+def _async_client(api_key: str) -> AsyncOpenAI:
+    """Cliente assíncrono da OpenAI, criado uma vez por API key (novas tentativas padrão do SDK)."""
+    return AsyncOpenAI(
+        api_key=api_key,
+        http_client=httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    )
+
+
+@lru_cache(maxsize=16)
+def _retrying_client(api_key: str, max_retries: int) -> AsyncOpenAI:
+    """
+    O mesmo cliente (e pool HTTP) com outro número de novas tentativas. O SDK repete
+    sozinho, com backoff exponencial e respeitando o Retry-After, as chamadas que falham
+    por rate limit, erro 5xx, timeout ou conexão; como a chamada roda dentro do semáforo,
+    as novas tentativas não aumentam a concorrência.
+    """
+    return _async_client(api_key).with_options(max_retries=max_retries)
+
 
 class OpenAIService:
     """
@@ -13,13 +250,30 @@ class OpenAIService:
     """
     
     @staticmethod
-    def create_chat_completion(
+    async def warmup(api_key: str) -> None:
+        """
+        Abre a conexão com a OpenAI no startup (models.list é barato), para a
+        primeira requisição de chat não pagar o handshake TCP+TLS.
+        Falhas só são registradas: a aplicação sobe mesmo sem a OpenAI. Sem novas
+        tentativas e com timeout curto, para a OpenAI lenta não segurar o startup.
+        """
+        try:
+            await _async_client(api_key).with_options(max_retries=0, timeout=5.0).models.list()
+            logger.info("Conexão com a OpenAI aquecida")
+        except Exception as e:
+            logger.warning(f"Não foi possível aquecer a conexão com a OpenAI: {str(e)}")
+    
+    
+    @staticmethod
+    async def create_chat_completion(
         api_key: str,
         message: str,
         model: str = "gpt-3.5-turbo",
         temperature: float = 0.7,
         max_tokens: int = 500,
-        conversation_history: Optional[List[Dict[str, str]]] = None
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        cache: bool = False,
+        history_window: int = 6
     ) -> Dict:
         """
         Cria uma completação de chat usando a API da OpenAI.
@@ -31,51 +285,26 @@ class OpenAIService:
             temperature: Controla a criatividade (0-2)
             max_tokens: Número máximo de tokens na resposta
             conversation_history: Histórico de mensagens anteriores
+            cache: Reaproveita respostas mesmo com temperature > 0
+            history_window: Quantas trocas (usuário + assistente) recentes do histórico enviar
             
         Returns:
             Dict com a resposta da API
             
         Raises:
-            Exception: Se houver erro na comunicação com a API
+            OpenAIError: Erros da API da OpenAI (repassados com o tipo original)
+            Exception: Se houver outro erro na comunicação com a API
         """
         try:
-            # Inicializa o cliente da OpenAI com a API key
-            client = OpenAI(api_key=api_key)
-            
-            # Monta o array de mensagens
-            messages = []
-            
-            # Adiciona histórico de conversas se existir
-            if conversation_history:
-                for msg in conversation_history:
-                    messages.append({
-                        "role": msg.get("role"),
-                        "content": msg.get("content")
-                    })
-            
-            # Adiciona a mensagem atual do usuário
-            messages.append({
-                "role": "user",
-                "content": message
-            })
+            messages = OpenAIService._chat_messages(message, conversation_history, history_window)
             
             logger.info(f"Enviando requisição para OpenAI - Modelo: {model}")
             
-            # Faz a requisição para a API
-            response = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
+            completion = await OpenAIService._complete(
+                api_key, messages, model, temperature, max_tokens, cache
             )
             
-            # Extrai informações da resposta
-            result = {
-                "response": response.choices[0].message.content,
-                "model": response.model,
-                "tokens_used": response.usage.total_tokens,
-                "finish_reason": response.choices[0].finish_reason
-            }
+            result = OpenAIService._completion_result(completion)
             
             logger.info(f"Resposta recebida - Tokens usados: {result['tokens_used']}")
             
@@ -83,9 +312,98 @@ class OpenAIService:
             
         except Exception as e:
             logger.error(f"Erro ao comunicar com OpenAI: {str(e)}")
+            # Erros da OpenAI sobem tipados para a rota decidir a mensagem
+            if isinstance(e, OpenAIError):
+                raise
             raise Exception(f"Erro ao processar requisição: {str(e)}")
     
     
+    @staticmethod
+    async def _complete(
+        api_key: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        cache: bool = False,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Faz a chamada chat.completions e devolve o conteúdo com os metadados.
+        Respostas determinísticas (temperature == 0) ou pedidas com cache=True são
+        guardadas e reaproveitadas para a mesma requisição.
+        """
+        # Chave com o max_tokens pedido: acerto no cache não paga a contagem de tokens
+        cache_key = None
+        if cache or temperature == 0:
+            cache_key = make_cache_key(model, messages, temperature, max_tokens, response_format)
+            cached = await _response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Resposta da OpenAI reaproveitada do cache - Modelo: {model}")
+                return cached
+
+        # tiktoken é CPU (e baixa o BPE na primeira vez): fora do event loop
+        max_tokens = await asyncio.to_thread(_clamp_max_tokens, model, messages, max_tokens)
+
+        # Limitada a OPENAI_MAX_CONCURRENCY chamadas simultâneas
+        async with _concurrency_limit():
+            client = _retrying_client(api_key, get_settings().OPENAI_MAX_RETRIES)
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format or NOT_GIVEN
+            )
+
+        completion = {
+            "content": response.choices[0].message.content,
+            "model": response.model,
+            "tokens_used": response.usage.total_tokens,
+            "finish_reason": response.choices[0].finish_reason
+        }
+        if cache_key is not None:
+            await _response_cache.set(cache_key, completion)
+        return completion
+    
+    
+    @staticmethod
+    def _chat_messages(
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        history_window: int = 6
+    ) -> List[Dict[str, str]]:
+        """
+        Monta o array de mensagens: histórico recente (se existir) + mensagem atual do usuário.
+        Só as últimas `history_window` trocas vão para a API, para o prompt não crescer sem limite.
+        """
+        messages = []
+        
+        # Adiciona as últimas trocas do histórico de conversas se existir
+        # (já vêm no formato {"role", "content"}, validadas pelo schema ChatMessage)
+        if conversation_history and history_window > 0:
+            messages.extend(conversation_history[-history_window * 2:])
+        
+        # Adiciona a mensagem atual do usuário
+        messages.append({
+            "role": "user",
+            "content": message
+        })
+        
+        return messages
+    
+    
+    @staticmethod
+    def _completion_result(completion: Dict[str, Any]) -> Dict:
+        """Formata o resultado de _complete para o chat genérico."""
+        return {
+            "response": completion["content"],
+            "model": completion["model"],
+            "tokens_used": completion["tokens_used"],
+            "finish_reason": completion["finish_reason"]
+        }
+    
+    
     @staticmethod
     def validate_api_key(api_key: str) -> bool:
         """
@@ -97,22 +415,11 @@ class OpenAIService:
         Returns:
             True se a chave é válida, False caso contrário
         """
-        if not api_key or not isinstance(api_key, str):
-            return False
-        
-        # API keys da OpenAI começam com 'sk-'
-        if not api_key.startswith("sk-"):
-            return False
-        
-        # Deve ter comprimento mínimo
-        if len(api_key) < 20:
-            return False
-        
-        return True
+        return isinstance(api_key, str) and _API_KEY_RE.fullmatch(api_key) is not None
     
     
     @staticmethod
-    def generate_area_description(
+    async def generate_area_description(
         api_key: str,
         area_data: Dict[str, Any],
         model: str = "gpt-3.5-turbo",
@@ -133,81 +440,288 @@ class OpenAIService:
             String com a descrição gerada
             
         Raises:
-            Exception: Se houver erro na comunicação com a API
+            OpenAIError: Erros da API da OpenAI (repassados com o tipo original)
+            Exception: Se houver outro erro na comunicação com a API
         """
         try:
-            # Inicializa o cliente da OpenAI
-            client = OpenAI(api_key=api_key)
-            
-            # Prepara o contexto para a IA
-            system_prompt = """You are an expert in ecology and botanical data analysis.
-Your task is to analyze phenological data from a plant monitoring area and generate a comprehensive and informative description.
-
-The data includes:
-- Plant species found in the area
-- Elevation data (height in meters)
-- Phenological observations over time (dates, phenophases, blooming status, descriptions)
-
-IMPORTANT INSTRUCTIONS:
-- DO NOT mention latitude or longitude coordinates
-- DO NOT mention any area IDs, identification numbers, or area codes
-- DO NOT say the location or area UNDER ANALYSIS. avoid saying under analysis or area under analysis.
-- DO NOT use phrases like "the area under analysis", "area ID", "in area X", or "area number Y"
-- Start your description naturally, for example: "In the location...", "The observed species...", "In this location...", or "The area..."
-- Only mention elevation/height when relevant
-- Focus on phenological phases (leaf budding, flowering, fruiting, etc.)
-- Analyze flowering patterns and their implications
-- Provide insights about the suitability of the location for planting
-- Follow the structure and writing style of the examples below
-
-EXAMPLE 1:
-"In the analyzed location, most species predominantly showed the beginning of leaf budding, with flowering records restricted to macrophyllum in April. This suggests that flowering is limited or occurs in a concentrated manner in few species, while the majority remains in vegetative phase for much of the year. Despite reduced flowering, consistent leaf growth indicates that the environment offers adequate conditions for plant development, making the location favorable for planting, although it is not characterized by abundant flowering periods."
-
-EXAMPLE 2:
-"The observed species predominantly showed the beginning of leaf budding and ripe fruits, with no flowering records throughout 2024. This indicates that, during the monitored period, the location did not favor expressive flowering periods, but vegetative growth and fruiting proved to be consistent. Thus, the environment is suitable for plant development, although it is not characterized by abundant flowering, being more suitable for those seeking cultivation with leaf growth and fruit production."
-
-The description must be in English and focused on phenological analysis useful for researchers and environmental managers."""
-
-            # Prepara os dados da área em formato legível
-            user_message = f"""Analyze the following phenological data and generate a description following the examples provided:
-
-Plants and Phenological Observations:
-{json.dumps(area_data.get('plants', []), indent=2, default=str)}
-
-Generate a comprehensive 1-2 paragraph description following the style and structure of the examples. Focus on phenological patterns, flowering behavior, and suitability for cultivation. Start your description naturally without mentioning any area identification numbers."""
-
             logger.info(f"Gerando descrição para área {area_data.get('id')}")
             
-            # Faz a requisição para a API
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens
+            completion = await OpenAIService._complete(
+                api_key,
+                OpenAIService._description_messages(area_data),
+                model,
+                temperature,
+                max_tokens
             )
             
-            description = response.choices[0].message.content.strip()
+            description = completion["content"].strip()
             
-            logger.info(f"Descrição gerada com sucesso - Tokens usados: {response.usage.total_tokens}")
+            logger.info(f"Descrição gerada com sucesso - Tokens usados: {completion['tokens_used']}")
             
             return description
             
         except Exception as e:
             logger.error(f"Erro ao gerar descrição da área: {str(e)}")
+            # Erros da OpenAI sobem tipados para a rota decidir a mensagem
+            if isinstance(e, OpenAIError):
+                raise
             raise Exception(f"Erro ao gerar descrição: {str(e)}")
     
     
     @staticmethod
-    def answer_area_question(
+    def _description_messages(area_data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Monta as mensagens (sistema + usuário) da descrição de uma área."""
+        # Prepara os dados da área em formato legível
+        user_message = f"""Analyze the following phenological data and generate a description following the examples provided:
+
+Plants and Phenological Observations:
+{_dump(_compact_plants(area_data.get('plants', [])))}
+
+Generate a comprehensive 1-2 paragraph description following the style and structure of the examples. Focus on phenological patterns, flowering behavior, and suitability for cultivation. Start your description naturally without mentioning any area identification numbers."""
+
+        return [_SYS_DESC, {"role": "user", "content": user_message}]
+    
+    
+    @staticmethod
+    async def submit_description_batch(
+        api_key: str,
+        areas: List[Dict[str, Any]],
+        model: str = "gpt-3.5-turbo",
+        temperature: float = 0.7,
+        max_tokens: int = 300
+    ) -> str:
+        """
+        Envia a geração de descrições para a Batch API da OpenAI (metade do custo,
+        resultado em até 24h). Cada área vira uma requisição com custom_id = id da área.
+        
+        Args:
+            api_key: Chave de API da OpenAI
+            areas: Lista de area_data (mesmo formato de generate_area_description)
+            model: Modelo a ser utilizado (default: gpt-3.5-turbo)
+            temperature: Controla a criatividade (0-2)
+            max_tokens: Número máximo de tokens de cada descrição
+            
+        Returns:
+            ID do batch criado na OpenAI
+        """
+        client = _async_client(api_key)
+
+        lines = [
+            orjson.dumps({
+                "custom_id": str(area_data["id"]),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": OpenAIService._description_messages(area_data),
+                    "temperature": temperature,
+                    "max_tokens": max_tokens
+                }
+            }, default=str)
+            for area_data in areas
+        ]
+
+        batch_file = await client.files.create(
+            file=("area_descriptions.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+
+        logger.info(f"Batch {batch.id} enviado com {len(areas)} áreas")
+
+        return batch.id
+    
+    
+    @staticmethod
+    async def poll_batch(api_key: str, batch_id: str, interval: float = 60.0):
+        """
+        Espera o batch terminar (consultando a cada `interval` segundos).
+        
+        Returns:
+            O objeto Batch da OpenAI no estado final (completed, failed, expired ou cancelled)
+        """
+        client = _async_client(api_key)
+        while True:
+            batch = await client.batches.retrieve(batch_id)
+            if batch.status in ("completed", "failed", "expired", "cancelled"):
+                logger.info(f"Batch {batch_id} finalizado com status {batch.status}")
+                return batch
+            logger.info(f"Batch {batch_id} em andamento ({batch.status})")
+            await asyncio.sleep(interval)
+    
+    
+    @staticmethod
+    async def description_batch_results(api_key: str, batch) -> Dict[int, str]:
+        """
+        Lê o arquivo de saída de um batch de descrições.
+        
+        Returns:
+            Dict id da área -> descrição. Requisições com erro ficam de fora.
+        """
+        if not batch.output_file_id:
+            return {}
+
+        content = await _async_client(api_key).files.content(batch.output_file_id)
+
+        descriptions = {}
+        for line in content.text.splitlines():
+            if not line:
+                continue
+            item = orjson.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning(f"Descrição da área {item.get('custom_id')} falhou no batch: {item.get('error')}")
+                continue
+            message = response["body"]["choices"][0]["message"]["content"]
+            descriptions[int(item["custom_id"])] = message.strip()
+        return descriptions
+    
+    
+    @staticmethod
+    async def generate_area_descriptions_batch(
+        api_key: str,
+        areas: List[Dict[str, Any]],
+        model: str = "gpt-3.5-turbo",
+        temperature: float = 0.7,
+        max_tokens_per_area: int = 300,
+        batch_size: int = 5,
+        max_prompt_tokens: int = 12000
+    ) -> Dict[int, str]:
+        """
+        Gera descrições para várias áreas agrupando até `batch_size` áreas por chamada
+        (resposta em JSON indexada pelo id da área). Os grupos rodam em paralelo,
+        limitados por OPENAI_MAX_CONCURRENCY.
+        
+        Args:
+            api_key: Chave de API da OpenAI
+            areas: Lista de area_data (mesmo formato de generate_area_description)
+            model: Modelo a ser utilizado (default: gpt-3.5-turbo)
+            temperature: Controla a criatividade (0-2)
+            max_tokens_per_area: Tokens de resposta reservados para cada área
+            batch_size: Máximo de áreas por chamada
+            max_prompt_tokens: Tamanho estimado máximo dos dados de cada chamada
+            
+        Returns:
+            Dict id da área -> descrição gerada. Áreas de grupos que falharam ficam de fora.
+        """
+        batches = OpenAIService._description_batches(areas, batch_size, max_prompt_tokens)
+
+        results = await asyncio.gather(
+            *(
+                OpenAIService._describe_batch(api_key, batch, model, temperature, max_tokens_per_area)
+                for batch in batches
+            ),
+            return_exceptions=True
+        )
+
+        descriptions = {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                ids = [entry["id"] for entry in batch]
+                logger.error(f"Erro ao gerar descrições para as áreas {ids}: {str(result)}")
+                continue
+            descriptions.update(result)
+
+        logger.info(f"Descrições geradas em lote: {len(descriptions)} de {len(areas)} áreas")
+
+        return descriptions
+    
+    
+    @staticmethod
+    def _description_batches(
+        areas: List[Dict[str, Any]],
+        batch_size: int,
+        max_prompt_tokens: int
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Agrupa as áreas (já compactadas) respeitando o número máximo por chamada
+        e o tamanho em tokens dos dados de cada chamada.
+        """
+        batches = []
+        current, current_tokens = [], 0
+        for area_data in areas:
+            entry = {"id": area_data["id"], "plants": _compact_plants(area_data.get("plants", []))}
+            tokens = _count_tokens(_dump(entry))
+            if current and (len(current) >= batch_size or current_tokens + tokens > max_prompt_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(entry)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+    
+    
+    @staticmethod
+    async def _describe_batch(
+        api_key: str,
+        batch: List[Dict[str, Any]],
+        model: str,
+        temperature: float,
+        max_tokens_per_area: int
+    ) -> Dict[int, str]:
+        """Gera as descrições de um grupo de áreas em uma única chamada."""
+        user_message = f"""Analyze the phenological data of each area below and generate one description per area following the examples provided.
+
+Return a JSON object in the format {{"descriptions": [{{"id": <area id>, "description": "<description>"}}]}} with exactly one entry per area. The id is only used to match the answer: never mention it inside the description.
+
+Areas:
+{_dump(batch)}"""
+
+        completion = await OpenAIService._complete(
+            api_key,
+            [_SYS_DESC, {"role": "user", "content": user_message}],
+            model,
+            temperature,
+            max_tokens_per_area * len(batch),
+            response_format={"type": "json_object"}
+        )
+
+        if completion["finish_reason"] == "length":
+            raise Exception("Resposta da OpenAI truncada (max_tokens insuficiente para o lote)")
+
+        payload = orjson.loads(completion["content"])
+        items = payload.get("descriptions") if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            logger.warning("Resposta do lote sem a lista 'descriptions'; nenhuma descrição aproveitada")
+            return {}
+
+        # Só aceita ids do próprio lote: um id inventado ou de outra área gravaria a
+        # descrição na área errada. Item malformado conta só como falta daquela área
+        expected = {entry["id"] for entry in batch}
+        descriptions = {}
+        for item in items:
+            try:
+                area_id = int(item["id"])
+                description = item["description"].strip()
+            except (KeyError, TypeError, ValueError, AttributeError):
+                logger.warning(f"Item malformado na resposta do lote descartado: {str(item)[:100]}")
+                continue
+            if area_id not in expected or area_id in descriptions:
+                logger.warning(f"Descrição para área {area_id} fora do lote (ou repetida) descartada")
+                continue
+            if description:
+                descriptions[area_id] = description
+
+        missing = expected - descriptions.keys()
+        if missing:
+            logger.warning(f"Lote sem descrição para as áreas {sorted(missing)}")
+        return descriptions
+    
+    
+    @staticmethod
+    async def answer_area_question(
         api_key: str,
         area_data: Dict[str, Any],
         question: str,
         model: str = "gpt-3.5-turbo",
         temperature: float = 0.7,
-        max_tokens: int = 500
+        max_tokens: int = 500,
+        cache: bool = False
     ) -> Dict[str, Any]:
         """
         Responde a uma pergunta específica sobre uma área baseada em seus dados.
@@ -219,95 +733,141 @@ Generate a comprehensive 1-2 paragraph description following the style and struc
             model: Modelo a ser utilizado (default: gpt-3.5-turbo)
             temperature: Controla a criatividade (0-2)
             max_tokens: Número máximo de tokens na resposta
+            cache: Reaproveita respostas mesmo com temperature > 0
             
         Returns:
             Dict contendo a resposta e metadados
             
         Raises:
-            Exception: Se houver erro na comunicação com a API
+            OpenAIError: Erros da API da OpenAI (repassados com o tipo original)
+            Exception: Se houver outro erro na comunicação com a API
         """
         try:
-            # Inicializa o cliente da OpenAI
-            client = OpenAI(api_key=api_key)
+            messages = OpenAIService._area_question_messages(area_data, question)
+
+            logger.info(f"Respondendo pergunta sobre área {area_data.get('id')}: {question[:50]}...")
             
-            # Prepara o contexto para a IA
-            system_prompt = """You are an expert in ecology, botany, and phenological data analysis.
-Your task is to answer questions about a specific plant monitoring area based on its data.
+            completion = await OpenAIService._complete(
+                api_key, messages, model, temperature, max_tokens, cache
+            )
+            
+            result = OpenAIService._answer_result(completion)
+            
+            logger.info(f"Resposta gerada com sucesso - Tokens usados: {result['tokens_used']}")
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Erro ao responder pergunta sobre área: {str(e)}")
+            # Erros da OpenAI sobem tipados para a rota decidir a mensagem
+            if isinstance(e, OpenAIError):
+                raise
+            raise Exception(f"Erro ao processar pergunta: {str(e)}")
+    
+    
+    @staticmethod
+    async def stream_area_answer(
+        api_key: str,
+        area_data: Dict[str, Any],
+        question: str,
+        model: str = "gpt-3.5-turbo",
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        cache: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Versão em streaming de answer_area_question: devolve os trechos da resposta
+        conforme a OpenAI gera o texto (stream=True).
+        
+        Args:
+            Mesmos de answer_area_question
+            
+        Yields:
+            Trechos da resposta, já sem aspas e quebras de linha
+            
+        Raises:
+            OpenAIError: Erros da API da OpenAI (repassados com o tipo original)
+        """
+        messages = OpenAIService._area_question_messages(area_data, question)
 
-The data includes:
-- Plant species found in the area
-- Geographic coordinates of the area (polygon)
-- Elevation data (height in meters)
-- Phenological observations over time (dates, phenophases, blooming status, descriptions)
+        # Mesma chave de _complete: o cache é compartilhado com answer_area_question
+        cache_key = None
+        if cache or temperature == 0:
+            cache_key = make_cache_key(model, messages, temperature, max_tokens, None)
+            cached = await _response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Resposta da OpenAI reaproveitada do cache - Modelo: {model}")
+                yield OpenAIService._answer_result(cached)["answer"]
+                return
 
-IMPORTANT INSTRUCTIONS:
-- Answer based ONLY on the provided data
-- Be specific and accurate in your responses
-- Focus on phenological information (leaf budding, flowering, fruiting, etc.)
-- Mention specific species when relevant
-- If the data doesn't contain information to answer the question, say so clearly
-- Provide insights about patterns, trends, or ecological significance when appropriate
-- Keep your answers clear, informative, and professional
-- ALWAYS answer in the SAME LANGUAGE as the user's question
-- Write in a natural, conversational style as a single continuous flowing text
-- DO NOT use ANY formatting characters: no **, no -, no #, no bullets, no quotation marks "", no apostrophes '', no backticks ``
-- When mentioning species names, write them directly without any quotes or special characters (e.g., write "the brevifolia species" not "the \"brevifolia\" species")
-- DO NOT use line breaks or paragraph separators (no \n)
-- Write everything as one continuous paragraph
-- Make your answers flow naturally like a conversation
-- Example: Instead of "brevifolia" and "ramosissima" write: brevifolia and ramosissima
+        max_tokens = await asyncio.to_thread(_clamp_max_tokens, model, messages, max_tokens)
+
+        logger.info(f"Respondendo (streaming) pergunta sobre área {area_data.get('id')}: {question[:50]}...")
+
+        completion = {"content": "", "model": model, "tokens_used": 0, "finish_reason": None}
+        parts = []
 
-Your answers should be helpful for researchers, environmental managers, and anyone interested in understanding the phenological patterns of the area."""
+        # Limitada a OPENAI_MAX_CONCURRENCY chamadas simultâneas
+        async with _concurrency_limit():
+            # No streaming o usuário espera o primeiro trecho: uma nova tentativa só
+            stream = await _retrying_client(api_key, _STREAM_MAX_RETRIES).chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async for chunk in stream:
+                # O último evento traz só o uso de tokens, sem choices
+                if chunk.usage is not None:
+                    completion["tokens_used"] = chunk.usage.total_tokens
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                completion["model"] = chunk.model
+                if choice.finish_reason:
+                    completion["finish_reason"] = choice.finish_reason
+                if choice.delta.content:
+                    parts.append(choice.delta.content)
+                    yield choice.delta.content.translate(_STREAM_CLEAN)
 
-            # Prepara os dados da área em formato legível
-            user_message = f"""Based on the following phenological data from a monitoring area, please answer the user's question:
+        completion["content"] = "".join(parts)
+        logger.info(f"Resposta (streaming) gerada com sucesso - Tokens usados: {completion['tokens_used']}")
+
+        if cache_key is not None:
+            await _response_cache.set(cache_key, completion)
+    
+    
+    @staticmethod
+    def _area_question_messages(area_data: Dict[str, Any], question: str) -> List[Dict[str, str]]:
+        """Monta as mensagens (sistema + usuário) da pergunta sobre uma área."""
+        # Prepara os dados da área em formato legível
+        user_message = f"""Based on the following phenological data from a monitoring area, please answer the user's question:
 
 Area Data:
 - Coordinates: {len(area_data.get('coordinates', []))} points defining the area polygon
 - Number of plants monitored: {len(area_data.get('plants', []))}
 
 Plants and Phenological Observations:
-{json.dumps(area_data.get('plants', []), indent=2, default=str)}
+{_dump(_compact_plants(area_data.get('plants', [])))}
 
 User Question: {question}
 
 Please provide a clear and informative answer based on the available data."""
 
-            logger.info(f"Respondendo pergunta sobre área {area_data.get('id')}: {question[:50]}...")
-            
-            # Faz a requisição para a API
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-            
-            answer = response.choices[0].message.content.strip()
-            
-            # Remove quebras de linha e múltiplos espaços
-            answer = answer.replace('\n', ' ').replace('\r', ' ')
-            # Remove aspas duplas e simples
-            answer = answer.replace('"', '').replace("'", '')
-            # Remove múltiplos espaços seguidos
-            while '  ' in answer:
-                answer = answer.replace('  ', ' ')
-            answer = answer.strip()
-            
-            result = {
-                "answer": answer,
-                "model": response.model,
-                "tokens_used": response.usage.total_tokens,
-                "finish_reason": response.choices[0].finish_reason
-            }
-            
-            logger.info(f"Resposta gerada com sucesso - Tokens usados: {result['tokens_used']}")
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Erro ao responder pergunta sobre área: {str(e)}")
-            raise Exception(f"Erro ao processar pergunta: {str(e)}")
\ No newline at end of file
+        return [_SYS_QA, {"role": "user", "content": user_message}]
+    
+    
+    @staticmethod
+    def _answer_result(completion: Dict[str, Any]) -> Dict[str, Any]:
+        """Extrai a resposta de _complete e remove a formatação que o modelo insiste em usar."""
+        # Remove aspas duplas e simples e junta quebras de linha/espaços seguidos em um espaço
+        answer = _WS_RE.sub(' ', completion["content"].translate(_DROP_QUOTES)).strip()
+        
+        return {
+            "answer": answer,
+            "model": completion["model"],
+            "tokens_used": completion["tokens_used"],
+            "finish_reason": completion["finish_reason"]
+        }
@@ -10,10 +10,13 @@ import json
 BASE_URL = "http://localhost:8000"
 API_KEY = "sk-sua-chave-aqui"  # Substitua pela sua chave da OpenAI
 
+# Uma sessão para todos os testes: a conexão com o servidor é reaproveitada (keep-alive)
+session = requests.Session()
+
 def test_health_check():
     """Testa o endpoint de health check"""
     print("🔍 Testando health check...")
-    response = requests.get(f"{BASE_URL}/openai/health")
+    response = session.get(f"{BASE_URL}/openai/health")
     print(f"Status: {response.status_code}")
     print(f"Resposta: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
     print()
@@ -30,7 +33,7 @@ def test_simple_chat():
         "max_tokens": 100
     }
     
-    response = requests.post(f"{BASE_URL}/openai/chat", json=data)
+    response = session.post(f"{BASE_URL}/openai/chat", json=data)
     print(f"Status: {response.status_code}")
     
     if response.status_code == 200:
@@ -62,7 +65,7 @@ def test_conversation_with_history():
         "max_tokens": 150
     }
     
-    response = requests.post(f"{BASE_URL}/openai/chat", json=data)
+    response = session.post(f"{BASE_URL}/openai/chat", json=data)
     print(f"Status: {response.status_code}")
     
     if response.status_code == 200:
@@ -82,7 +85,7 @@ def test_invalid_api_key():
         "api_key": "chave-invalida"
     }
     
-    response = requests.post(f"{BASE_URL}/openai/chat", json=data)
+    response = session.post(f"{BASE_URL}/openai/chat", json=data)
     print(f"Status: {response.status_code}")
     print(f"Resposta: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
     print()
@@ -96,7 +99,7 @@ def test_empty_message():
         "api_key": API_KEY
     }
     
-    response = requests.post(f"{BASE_URL}/openai/chat", json=data)
+    response = session.post(f"{BASE_URL}/openai/chat", json=data)
     print(f"Status: {response.status_code}")
     print(f"Resposta: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
     print()
@@ -132,6 +135,8 @@ if __name__ == "__main__":
         print("Certifique-se de que a aplicação está rodando em http://localhost:8000")
     except Exception as e:
         print(f"❌ Erro inesperado: {e}")
+    finally:
+        session.close()
     
     print()
     print("=" * 60)
@@ -1,123 +1,200 @@
+import io
+
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import Integer, column, func, insert, select, update, values
 from models.site import Site
 from models.plant import Plant
 from models.observation import Observation
-from sqlalchemy.orm import Session
-from utils.poligon import points_in_circle, generate_polygon
+from db.session import engine
+from utils.poligon import generate_polygon
 from models.area import Area, AreaCoordinate
 
 
-# ⚡ Lê CSV
-df = pd.read_csv("data/flores.csv")
-
-# ⚡ Conexão com o banco
-from core.config import settings
-engine = create_engine(settings.db_url, echo=False)
-
-# ----------------------
-# 1️⃣ Sites únicos
-# ----------------------
-sites_df = df[["Site_ID", "Latitude", "Longitude", "Elevation_in_Meters"]].drop_duplicates()
-sites_df = sites_df.rename(columns={
-    "Site_ID": "id",
-    "Latitude": "latitude",
-    "Longitude": "longitude",
-    "Elevation_in_Meters": "elevation"
-})
-
-# Remove duplicatas já existentes
-existing_sites = pd.read_sql("SELECT id FROM sites", engine)["id"].tolist()
-sites_df = sites_df[~sites_df["id"].isin(existing_sites)]
-
-sites_df.to_sql("sites", engine, if_exists="append", index=False, method="multi")
-
-# ----------------------
-# 2️⃣ Plants únicos por Site e Species
-# ----------------------
-# ----------------------
-# 2️⃣ Plants únicos por Site e Species (area_id nulo)
-# ----------------------
-plants_df = df[["Site_ID", "Species"]].drop_duplicates()
-plants_df = plants_df.rename(columns={"Site_ID": "site_id", "Species": "species"})
-plants_df["area_id"] = None  # vai ficar nulo por enquanto
-
-# Remove duplicatas já existentes
-existing_plants = pd.read_sql("SELECT site_id, species FROM plants", engine)
-plants_df = plants_df.merge(existing_plants, on=["site_id", "species"], how="left", indicator=True)
-plants_df = plants_df[plants_df["_merge"] == "left_only"].drop(columns="_merge")
-
-plants_df.to_sql("plants", engine, if_exists="append", index=False, method="multi")
-session = Session(engine)
-
-# Pega todos os plants com latitude e longitude do site
-plants_sql = pd.read_sql("""
-SELECT p.id as plant_id, s.latitude, s.longitude, p.site_id
-FROM plants p
-JOIN sites s ON p.site_id = s.id
-""", engine)
-radius_m = 1000  # 1 km
-
-# Agrupa por site (ou outro critério)
-# Agrupa por site
-for site_id, group in plants_sql.groupby("site_id"):
-    points = list(zip(group["latitude"], group["longitude"]))
-
-    # Se tiver 1 ou 2 plantas, cria "polígono" com os próprios pontos
+def copy_dataframe(df, table, conn, chunk_size=50_000):
+    """
+    Grava o DataFrame com COPY ... FROM STDIN (CSV) em blocos de `chunk_size` linhas,
+    dentro da transação da conexão `conn`. Bem mais rápido que INSERTs para cargas grandes.
+    """
+    columns = ", ".join(f'"{col}"' for col in df.columns)
+    sql = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+
+    with conn.connection.cursor() as cur:
+        for start in range(0, len(df), chunk_size):
+            buf = io.StringIO()
+            df.iloc[start:start + chunk_size].to_csv(buf, index=False, header=False)
+            buf.seek(0)
+            cur.copy_expert(sql, buf)
+
+
+def copy_new_rows(df, table, key_columns, conn):
+    """
+    Carrega o DataFrame numa tabela temporária com COPY e insere em `table` só as linhas
+    cuja chave (`key_columns`) ainda não existe. A deduplicação roda no banco, sem trazer
+    as chaves já gravadas para o Python.
+    """
+    stage = f"{table}_stage"
+    columns = ", ".join(f'"{col}"' for col in df.columns)
+    matches = " AND ".join(f't."{col}" = s."{col}"' for col in key_columns)
+
+    conn.exec_driver_sql(
+        f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA"
+    )
+    copy_dataframe(df, stage, conn)
+    conn.exec_driver_sql(
+        f"INSERT INTO {table} ({columns}) "
+        f"SELECT {columns} FROM {stage} s "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {matches})"
+    )
+
+
+def site_polygon(points):
+    """Polígono de um site; com 1 ou 2 plantas, o "polígono" são os próprios pontos."""
     if len(points) < 3:
-        polygon_coords = points
-    else:
-        polygon_coords = generate_polygon(points)
-
-    if polygon_coords:
-        new_area = Area()
-        session.add(new_area)
-        session.commit()
-        session.refresh(new_area)
-
-        for i, (lat, lon) in enumerate(polygon_coords):
-            coord = AreaCoordinate(area_id=new_area.id, latitude=lat, longitude=lon, order=i)
-            session.add(coord)
-        session.commit()
-
-        plant_ids = group["plant_id"].tolist()
-        session.query(Plant).filter(Plant.id.in_(plant_ids))\
-            .update({"area_id": new_area.id}, synchronize_session=False)
-        session.commit()
-
-
-# ----------------------
-# 3️⃣ Observations
-# ----------------------
-
-df["Phenophase_Description"] = df["Phenophase_Description"].str.strip()
-
-blooming_ids = [500, 501,502]
-df["is_blooming"] = df["Phenophase_ID"].isin(blooming_ids)
-
-observations_df = df.rename(columns={
-    "Observation_ID": "id",
-    "Site_ID": "site_id",
-    "Species": "species",
-    "Phenophase_ID": "phenophase_id",
-    "Phenophase_Description": "description",  # aqui!
-    "Observation_Date": "observation_date"
-})[["id", "site_id", "species", "phenophase_id","description", "observation_date", "is_blooming"]]
-
-# ⚡ Para associar Plant ID, cria mapeamento rápido
-
-plants_mapping = pd.read_sql("SELECT id, site_id, species FROM plants", engine)
-observations_df["species"] = observations_df["species"].str.strip().str.lower()
-
-plants_mapping["species"] = plants_mapping["species"].str.strip().str.lower()
-
-observations_df = observations_df.merge(plants_mapping, on=["site_id", "species"], how="left")
-observations_df = observations_df.rename(columns={"id_y": "plant_id", "id_x": "id"})
-observations_df = observations_df[["id", "site_id", "plant_id", "phenophase_id", "description", "observation_date", "is_blooming"]]
-
-# Remove duplicatas já existentes
-existing_obs = pd.read_sql("SELECT id FROM observations", engine)["id"].tolist()
-observations_df = observations_df[~observations_df["id"].isin(existing_obs)]
-missing_plants = observations_df[observations_df["plant_id"].isna()]
-
-observations_df.to_sql("observations", engine, if_exists="append", index=False, method="multi")
+        return [tuple(p) for p in points]
+    return generate_polygon(points)
+
+
+def normalize_species(species):
+    """
+    strip + lower só nos nomes distintos (poucas espécies para muitas linhas)
+    e mapeia o resultado de volta para a coluna.
+    """
+    return species.map({name: name.strip().lower() for name in species.dropna().unique()})
+
+
+# ⚡ Lê CSV: só as colunas usadas, já tipadas (texto repetido vira category)
+df = pd.read_csv(
+    "data/flores.csv",
+    usecols=[
+        "Observation_ID", "Site_ID", "Latitude", "Longitude", "Elevation_in_Meters",
+        "Species", "Phenophase_ID", "Phenophase_Description", "Observation_Date",
+    ],
+    dtype={
+        "Observation_ID": "int64",
+        "Site_ID": "int32",
+        "Latitude": "float64",
+        "Longitude": "float64",
+        "Elevation_in_Meters": "int32",
+        "Species": "category",
+        "Phenophase_ID": "int16",
+        "Phenophase_Description": "category",
+    },
+    parse_dates=["Observation_Date"],
+)
+
+# Toda a carga numa única transação: ou entra tudo, ou nada
+with engine.begin() as conn:
+    # ----------------------
+    # 1️⃣ Sites únicos
+    # ----------------------
+    sites_df = df[["Site_ID", "Latitude", "Longitude", "Elevation_in_Meters"]].drop_duplicates()
+    sites_df = sites_df.rename(columns={
+        "Site_ID": "id",
+        "Latitude": "latitude",
+        "Longitude": "longitude",
+        "Elevation_in_Meters": "elevation"
+    })
+
+    copy_new_rows(sites_df, "sites", ["id"], conn)
+
+    # ----------------------
+    # 2️⃣ Plants únicos por Site e Species
+    # ----------------------
+    # ----------------------
+    # 2️⃣ Plants únicos por Site e Species (area_id nulo)
+    # ----------------------
+    plants_df = df[["Site_ID", "Species"]].drop_duplicates()
+    plants_df = plants_df.rename(columns={"Site_ID": "site_id", "Species": "species"})
+
+    # id vem da sequence; area_id fica nulo (coluna fora do COPY)
+    copy_new_rows(plants_df, "plants", ["site_id", "species"], conn)
+
+    # Pega todos os plants com latitude e longitude do site (única leitura de volta:
+    # serve para os polígonos e para o mapeamento das observações)
+    plants_sql = pd.read_sql("""
+    SELECT p.id as plant_id, s.latitude, s.longitude, p.site_id, p.species
+    FROM plants p
+    JOIN sites s ON p.site_id = s.id
+    """, conn)
+    radius_m = 1000  # 1 km
+
+    # Agrupa por site: primeiro só calcula os polígonos, sem tocar no banco
+    # (os grupos são só índices sobre os arrays numpy, sem montar um DataFrame por site)
+    coords = plants_sql[["latitude", "longitude"]].to_numpy(dtype=float)
+    plant_id_values = plants_sql["plant_id"].to_numpy()
+    polygons = []
+    for rows in plants_sql.groupby("site_id").indices.values():
+        polygon_coords = site_polygon(coords[rows])
+        if polygon_coords:
+            polygons.append((polygon_coords, plant_id_values[rows].tolist()))
+
+    if polygons:
+        # Reserva todos os ids de área de uma vez e grava tudo em lote
+        area_ids = conn.execute(
+            select(func.nextval(func.pg_get_serial_sequence("areas", "id")))
+            .select_from(func.generate_series(1, len(polygons)))
+        ).scalars().all()
+
+        conn.execute(insert(Area.__table__), [{"id": area_id} for area_id in area_ids])
+        conn.execute(insert(AreaCoordinate.__table__), [
+            {"area_id": area_id, "latitude": lat, "longitude": lon, "order": i}
+            for area_id, (polygon_coords, _) in zip(area_ids, polygons)
+            for i, (lat, lon) in enumerate(polygon_coords)
+        ])
+
+        # Todas as plantas num único UPDATE plants ... FROM (VALUES (plant_id, area_id), ...)
+        plants = Plant.__table__
+        assignments = values(
+            column("plant_id", Integer), column("area_id", Integer), name="assignments"
+        ).data([
+            (plant_id, area_id)
+            for area_id, (_, plant_ids) in zip(area_ids, polygons)
+            for plant_id in plant_ids
+        ])
+        conn.execute(
+            update(plants)
+            .where(plants.c.id == assignments.c.plant_id)
+            .values(area_id=assignments.c.area_id)
+        )
+
+    # ----------------------
+    # 3️⃣ Observations
+    # ----------------------
+
+    # a coluna é category: o strip roda só nas poucas descrições distintas
+    descriptions = df["Phenophase_Description"]
+    df["Phenophase_Description"] = descriptions.map(
+        {name: name.strip() for name in descriptions.cat.categories}
+    )
+
+    # fenofases de floração: ids 500, 501 e 502 (faixa contínua)
+    phenophase_ids = df["Phenophase_ID"].to_numpy()
+    df["is_blooming"] = (phenophase_ids >= 500) & (phenophase_ids <= 502)
+
+    observations_df = df.rename(columns={
+        "Observation_ID": "id",
+        "Site_ID": "site_id",
+        "Species": "species",
+        "Phenophase_ID": "phenophase_id",
+        "Phenophase_Description": "description",  # aqui!
+        "Observation_Date": "observation_date"
+    })[["id", "site_id", "species", "phenophase_id","description", "observation_date", "is_blooming"]]
+
+    # ⚡ Para associar Plant ID, dicionário (site_id, espécie normalizada) -> plant_id
+
+    plant_ids = dict(zip(
+        zip(plants_sql["site_id"], normalize_species(plants_sql["species"])),
+        plants_sql["plant_id"]
+    ))
+
+    observations_df["species"] = normalize_species(observations_df["species"])
+    # Int64 (nullable) para o COPY receber "123" e não "123.0" quando há plant_id nulo
+    observations_df["plant_id"] = pd.array(
+        [plant_ids.get(key) for key in zip(observations_df["site_id"], observations_df["species"])],
+        dtype="Int64"
+    )
+    observations_df = observations_df[["id", "site_id", "plant_id", "phenophase_id", "description", "observation_date", "is_blooming"]]
+
+    missing_plants = observations_df[observations_df["plant_id"].isna()]
+
+    copy_new_rows(observations_df, "observations", ["id"], conn)
@@ -0,0 +1,127 @@
+"""
+Gera as descrições das áreas que ainda não têm uma.
+
+Uso:
+    python -m utils.generateDescriptions              # agora, várias áreas por chamada
+    python -m utils.generateDescriptions --submit     # via Batch API (metade do custo, até 24h)
+    python -m utils.generateDescriptions --collect ID # espera o batch ID e salva o resultado
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import selectinload
+
+from core.config import settings
+from core.logging import setup_logging
+from db.async_session import AsyncSessionLocal, async_engine
+from models.area import Area
+from models.plant import Plant
+from schemas.area import AreaResponse
+from services.observations import load_monthly_observations
+from services.openai_service import OpenAIService
+
+logger = logging.getLogger(__name__)
+
+
+async def load_areas_without_description(db):
+    """
+    Carrega todas as áreas sem descrição no mesmo formato de area_data usado pela rota
+    (observações mensais de todas as plantas em uma única query).
+    """
+    result = await db.execute(
+        select(Area).options(
+            selectinload(Area.coordinates),
+            selectinload(Area.plants)
+                .joinedload(Plant.site)
+        ).where(Area.description.is_(None)).order_by(Area.id)
+    )
+    areas = result.unique().scalars().all()
+
+    await load_monthly_observations(db, [plant for area in areas for plant in area.plants])
+
+    return [
+        AreaResponse.model_validate(area).model_dump(exclude={"description"})
+        for area in areas
+    ]
+
+
+async def save_descriptions(db, descriptions):
+    """Grava as descrições em um único executemany, sem sobrescrever as que já existem."""
+    if not descriptions:
+        return
+
+    table = Area.__table__
+    await db.execute(
+        update(table)
+        .where(table.c.id == bindparam("area_id"), table.c.description.is_(None))
+        .values(description=bindparam("new_description")),
+        [
+            {"area_id": area_id, "new_description": description}
+            for area_id, description in descriptions.items()
+        ]
+    )
+    await db.commit()
+
+
+async def generate_now(api_key: str):
+    async with AsyncSessionLocal() as db:
+        areas = await load_areas_without_description(db)
+
+    if not areas:
+        logger.info("Todas as áreas já têm descrição")
+        return
+
+    logger.info(f"Gerando descrições para {len(areas)} áreas")
+    descriptions = await OpenAIService.generate_area_descriptions_batch(api_key=api_key, areas=areas)
+    async with AsyncSessionLocal() as db:
+        await save_descriptions(db, descriptions)
+    logger.info(f"{len(descriptions)} descrições salvas")
+
+
+async def submit(api_key: str):
+    async with AsyncSessionLocal() as db:
+        areas = await load_areas_without_description(db)
+
+    if not areas:
+        logger.info("Todas as áreas já têm descrição")
+        return
+
+    batch_id = await OpenAIService.submit_description_batch(api_key=api_key, areas=areas)
+    logger.info(f"Para salvar o resultado: python -m utils.generateDescriptions --collect {batch_id}")
+
+
+async def collect(api_key: str, batch_id: str):
+    batch = await OpenAIService.poll_batch(api_key, batch_id)
+    descriptions = await OpenAIService.description_batch_results(api_key, batch)
+    async with AsyncSessionLocal() as db:
+        await save_descriptions(db, descriptions)
+    logger.info(f"{len(descriptions)} descrições salvas")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Gera as descrições das áreas sem descrição")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--submit", action="store_true", help="envia para a Batch API da OpenAI")
+    group.add_argument("--collect", metavar="BATCH_ID", help="espera o batch e salva as descrições")
+    args = parser.parse_args()
+
+    setup_logging()
+
+    if not settings.OPENAI_API_KEY:
+        raise SystemExit("OPENAI_API_KEY não configurada")
+
+    try:
+        if args.submit:
+            await submit(settings.OPENAI_API_KEY)
+        elif args.collect:
+            await collect(settings.OPENAI_API_KEY, args.collect)
+        else:
+            await generate_now(settings.OPENAI_API_KEY)
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
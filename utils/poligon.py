@@ -1,30 +1,46 @@
 import numpy as np
 from scipy.spatial import ConvexHull, QhullError
 import warnings
-from math import radians, sin, cos, sqrt, atan2
+from itertools import compress
+
+EARTH_RADIUS = 6371000  # metros
 
 def haversine(lat1, lon1, lat2, lon2):
-    R = 6371000  # metros
-    phi1, phi2 = radians(lat1), radians(lat2)
-    dphi = radians(lat2 - lat1)
-    dlambda = radians(lon2 - lon1)
-    a = sin(dphi/2)**2 + cos(phi1)*cos(phi2)*sin(dlambda/2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
+    """Distância em metros; aceita escalares ou arrays numpy (calcula tudo de uma vez)."""
+    R = EARTH_RADIUS
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = np.radians(np.subtract(lat2, lat1))
+    dlambda = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(dphi/2)**2 + np.cos(phi1)*np.cos(phi2)*np.sin(dlambda/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
     return R * c
 
 def points_in_circle(points, center, radius):
-    lat_c, lon_c = center
-    return [p for p in points if haversine(p[0], p[1], lat_c, lon_c) <= radius]
+    # raio negativo não contém nenhum ponto (como em haversine(...) <= radius)
+    if len(points) == 0 or radius < 0:
+        return []
+    pts = np.asarray(points, dtype=float)
+    # o centro é fixo: radianos e cosseno dele calculados uma vez só
+    lat_c, lon_c = np.radians(center)
+    phi = np.radians(pts[:, 0])
+    a = np.sin((phi - lat_c)/2)**2 + np.cos(phi)*np.cos(lat_c)*np.sin((np.radians(pts[:, 1]) - lon_c)/2)**2
+    # distância <= raio  <=>  a <= sin²(raio/2R): compara direto, sem arctan2/sqrt por ponto
+    inside = a <= np.sin(min(radius / (2 * EARTH_RADIUS), np.pi / 2))**2
+    # devolve os próprios pontos recebidos, como antes
+    return list(compress(points, inside))
 
 def generate_polygon(points, site_point=None):
-    points = list(set(points))  # remove duplicatas
-    if len(points) < 3:
+    # remove duplicatas direto no numpy (sem set de tuplas de float)
+    pts = np.unique(np.asarray(points, dtype=float).reshape(-1, 2), axis=0)
+    if len(pts) < 3:
         # retorna o ponto do site se fornecido, senão os próprios pontos
-        return [site_point] if site_point else points
-    pts = np.array(points)
+        return [site_point] if site_point else [tuple(p) for p in pts]
+    # pontos colineares não formam polígono: detecta antes, sem passar pelo QhullError
+    if np.linalg.matrix_rank(pts - pts.mean(axis=0)) < 2:
+        return [site_point] if site_point else [tuple(p) for p in pts]
     try:
         hull = ConvexHull(pts)
         return [tuple(pts[v]) for v in hull.vertices]
     except QhullError:
-        warnings.warn("Não foi possível criar o polígono: pontos colineares ou problemas numéricos")
-        return [site_point] if site_point else points
+        warnings.warn("Não foi possível criar o polígono: problemas numéricos")
+        return [site_point] if site_point else [tuple(p) for p in pts]
@@ -1,15 +1,9 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from db.session import SessionLocal
 from utils.poligon import generate_polygon, points_in_circle
 from models.area import Area, AreaCoordinate
 from models.plant import Plant
 from models.site import Site
 from models.observation import Observation
-from core.config import settings
-
-# Conexão
-engine = create_engine(settings.db_url, echo=False)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 with SessionLocal() as session:
     # Pega alguns plants de teste